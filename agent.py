@@ -0,0 +1,228 @@
+import json
+import re
+import time
+import logging
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Tuple, Callable
+
+logger = logging.getLogger("napier.agent")
+
+# Separator between tool ID and action in the function names advertised to the model
+TOOL_NAME_SEPARATOR = "__"
+
+
+class TurnStats:
+    """
+    Timing and budget accounting for a single agent turn
+    """
+    def __init__(self):
+        self.steps = 0
+        self.model_seconds = 0.0
+        self.tool_seconds = 0.0
+        self.tool_calls: List[Dict[str, Any]] = []
+        self.budget_exhausted = False
+        self._started = time.monotonic()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "steps": self.steps,
+            "total_seconds": round(self.elapsed(), 3),
+            "model_seconds": round(self.model_seconds, 3),
+            "tool_seconds": round(self.tool_seconds, 3),
+            "tool_calls": self.tool_calls,
+            "budget_exhausted": self.budget_exhausted,
+        }
+
+
+class Agent:
+    """
+    Tool-calling loop connecting an Ollama model to the tools registered in an MCP Host
+    """
+    def __init__(self, mcp_host, ollama_url: str = "http://localhost:11434",
+                 max_steps: int = 5, max_seconds: float = 120.0, max_parallel_tools: int = 4):
+        """
+        Initialize the agent
+
+        Args:
+            mcp_host: MCPHost whose tools are advertised to the model
+            ollama_url: Base URL of the Ollama server
+            max_steps: Maximum number of model calls per turn
+            max_seconds: Wall-clock budget per turn
+            max_parallel_tools: Maximum number of tool calls executed concurrently
+        """
+        self.mcp_host = mcp_host
+        self.ollama_url = ollama_url.rstrip("/")
+        self.max_steps = max(1, int(max_steps))
+        self.max_seconds = float(max_seconds)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_parallel_tools)),
+                                            thread_name_prefix="napier-tool")
+
+    def build_tool_specs(self) -> Tuple[List[Dict[str, Any]], Dict[str, Tuple[str, str]]]:
+        """
+        Build the Ollama tool definitions for every action of every registered tool
+
+        Returns:
+            Tuple of the tool definitions and a mapping of function name to (tool_id, action)
+        """
+        specs = []
+        index = {}
+        for tool_id, client in self.mcp_host.get_all_tools().items():
+            for action in client.describe_actions():
+                function_name = re.sub(r"[^A-Za-z0-9_]", "_", f"{tool_id}{TOOL_NAME_SEPARATOR}{action['name']}")
+                index[function_name] = (tool_id, action["name"])
+                specs.append({
+                    "type": "function",
+                    "function": {
+                        "name": function_name,
+                        "description": action["description"],
+                        "parameters": action["parameters"],
+                    }
+                })
+        return specs, index
+
+    def _call_model(self, model: str, messages: List[Dict[str, Any]],
+                    tools: Optional[List[Dict[str, Any]]], timeout: float,
+                    on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        payload = {"model": model, "messages": messages, "stream": on_event is not None}
+        if tools:
+            payload["tools"] = tools
+        response = requests.post(f"{self.ollama_url}/api/chat", json=payload, timeout=timeout, stream=True)
+        if response.status_code == 400 and tools and "does not support tools" in response.text:
+            logger.warning(f"Model {model} does not support tools, continuing without them")
+            response.close()
+            payload.pop("tools")
+            response = requests.post(f"{self.ollama_url}/api/chat", json=payload, timeout=timeout, stream=True)
+        with response:
+            if response.status_code != 200:
+                raise RuntimeError(f"Ollama returned {response.status_code}: {response.text}")
+            if on_event is None:
+                return response.json()["message"]
+
+            # Stream the answer as "delta" events; tool calls arrive whole in their own chunks
+            content = []
+            tool_calls = []
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line).get("message", {})
+                if chunk.get("content"):
+                    content.append(chunk["content"])
+                    on_event({"type": "delta", "content": chunk["content"]})
+                tool_calls.extend(chunk.get("tool_calls") or [])
+        message = {"role": "assistant", "content": "".join(content)}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        return message
+
+    def _execute_tool_call(self, call: Dict[str, Any], index: Dict[str, Tuple[str, str]]) -> Dict[str, Any]:
+        function = call.get("function", {})
+        name = function.get("name", "")
+        arguments = function.get("arguments") or {}
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments)
+            except ValueError:
+                return {"error": f"Invalid arguments for {name}: {arguments}"}
+        if name not in index:
+            return {"error": f"Unknown tool {name}"}
+        tool_id, action = index[name]
+        return self.mcp_host.execute_action(tool_id, action, arguments)
+
+    def _run_tool_calls(self, calls: List[Dict[str, Any]], index: Dict[str, Tuple[str, str]],
+                        stats: TurnStats, timeout: float,
+                        on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Execute the tool calls of one model step concurrently and return the tool messages"""
+        started = time.monotonic()
+        futures = []
+        for call in calls:
+            if on_event:
+                function = call.get("function", {})
+                on_event({"type": "tool_call", "name": function.get("name"), "arguments": function.get("arguments")})
+            call_started = time.monotonic()
+            future = self._executor.submit(self._execute_tool_call, call, index)
+            futures.append((call, call_started, future))
+
+        wait([future for _, _, future in futures], timeout=max(0.0, timeout))
+
+        messages = []
+        for call, call_started, future in futures:
+            name = call.get("function", {}).get("name", "")
+            if future.done():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": f"Tool {name} failed: {e}"}
+                duration = time.monotonic() - call_started
+            else:
+                stats.budget_exhausted = True
+                result = {"error": f"Tool {name} exceeded the turn time budget"}
+                duration = timeout
+            stats.tool_calls.append({"name": name, "seconds": round(duration, 3),
+                                     "error": isinstance(result, dict) and "error" in result})
+            if on_event:
+                on_event({"type": "tool_result", **stats.tool_calls[-1]})
+            messages.append({"role": "tool", "tool_name": name, "content": json.dumps(result, default=str)})
+        stats.tool_seconds += time.monotonic() - started
+        return messages
+
+    def run(self, model: str, messages: List[Dict[str, Any]],
+            on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Run one agent turn: call the model, execute requested tools and feed the results back
+        until the model answers or the step/time budget is spent
+
+        Args:
+            model: Ollama model name
+            messages: Conversation so far, ending with the user message
+            on_event: Called with "delta", "tool_call" and "tool_result" events, which also makes the
+                model calls stream; exceptions it raises abort the turn
+
+        Returns:
+            Dict[str, Any]: Final assistant message, all messages added during the turn and timing
+        """
+        stats = TurnStats()
+        tools, index = self.build_tool_specs()
+        conversation = list(messages)
+        new_messages = []
+        message = {"role": "assistant", "content": ""}
+
+        for step in range(self.max_steps):
+            remaining = self.max_seconds - stats.elapsed()
+            if remaining <= 0:
+                stats.budget_exhausted = True
+                break
+
+            # The last step never advertises tools so the model has to answer
+            step_tools = tools if step < self.max_steps - 1 else None
+            model_started = time.monotonic()
+            try:
+                message = self._call_model(model, conversation, step_tools, timeout=remaining, on_event=on_event)
+            finally:
+                stats.model_seconds += time.monotonic() - model_started
+                stats.steps += 1
+
+            conversation.append(message)
+            new_messages.append(message)
+
+            tool_calls = message.get("tool_calls") or []
+            if not tool_calls or step_tools is None:
+                break
+
+            tool_messages = self._run_tool_calls(tool_calls, index, stats,
+                                                 timeout=self.max_seconds - stats.elapsed(), on_event=on_event)
+            conversation.extend(tool_messages)
+            new_messages.extend(tool_messages)
+
+        # Either the step or the time budget ran out while the model still wanted tools
+        if message.get("tool_calls") or (stats.budget_exhausted and not new_messages):
+            stats.budget_exhausted = True
+            message = {"role": "assistant",
+                       "content": "I could not finish within the tool budget for this turn."}
+            new_messages.append(message)
+
+        logger.debug(f"Agent turn finished: {stats.to_dict()}")
+        return {"message": message, "messages": new_messages, "timing": stats.to_dict()}
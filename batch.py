@@ -0,0 +1,385 @@
+import json
+import os
+import time
+import uuid
+import logging
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+logger = logging.getLogger("napier.batch")
+
+# Options accepted in OpenAI-style request bodies and their Ollama equivalents
+OPENAI_OPTIONS = {
+    "temperature": "temperature",
+    "top_p": "top_p",
+    "seed": "seed",
+    "stop": "stop",
+    "max_tokens": "num_predict",
+}
+
+
+def parse_batch_line(line: Dict[str, Any], line_number: int, default_model: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Normalize one line of a batch input file into a custom ID and an Ollama chat request
+
+    Accepts OpenAI batch lines ({"custom_id", "method", "url", "body": {...}}),
+    plain chat requests ({"custom_id", "model", "messages"}) and prompt lines
+    whose "body" or "prompt" is a string.
+
+    Args:
+        line: Parsed JSON line
+        line_number: Line number, used as ID when the line has none
+        default_model: Model used when the line does not name one
+
+    Returns:
+        Tuple of the custom ID and the Ollama chat request
+    """
+    custom_id = str(line.get("custom_id") or line.get("id") or line.get("request_id") or f"line-{line_number}")
+    body = line.get("body", line)
+    if isinstance(body, str):
+        body = {"messages": [{"role": "user", "content": body}]}
+    messages = body.get("messages")
+    if messages is None and "prompt" in body:
+        messages = [{"role": "user", "content": body["prompt"]}]
+    if not messages:
+        raise ValueError(f"Line {line_number} has no messages")
+
+    request = {"model": body.get("model") or default_model, "messages": messages, "stream": False}
+    options = dict(body.get("options", {}))
+    for openai_name, ollama_name in OPENAI_OPTIONS.items():
+        if openai_name in body:
+            options[ollama_name] = body[openai_name]
+    if options:
+        request["options"] = options
+    return custom_id, request
+
+
+def to_openai_completion(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an Ollama chat response into an OpenAI chat.completion object"""
+    prompt_tokens = response.get("prompt_eval_count", 0)
+    completion_tokens = response.get("eval_count", 0)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": response.get("model"),
+        "choices": [{
+            "index": 0,
+            "message": response.get("message", {}),
+            "finish_reason": "length" if response.get("done_reason") == "length" else "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+class BatchJob:
+    """
+    Offline batch of chat requests read from a JSONL file and written to an output JSONL file
+
+    The output file doubles as the checkpoint: lines whose custom ID already
+    has a result in it are skipped, so a restarted job resumes where it stopped.
+    Results that failed with a retryable error (5xx, unreachable backend) do
+    not count as done and are sent again; the latest record for an ID wins.
+    """
+    def __init__(self, input_path: str, output_path: str, backends: List[str], default_model: str,
+                 concurrency: int = 4, model_concurrency: Optional[Dict[str, int]] = None,
+                 max_retries: int = 2, timeout: float = 600):
+        """
+        Initialize a batch job
+
+        Args:
+            input_path: Path of the input JSONL file
+            output_path: Path of the output JSONL file
+            backends: Ollama base URLs the requests are spread across
+            default_model: Model used for lines that do not name one
+            concurrency: Maximum number of requests in flight overall
+            model_concurrency: Maximum number of requests in flight per model
+            max_retries: Retries for requests that fail to reach a backend
+            timeout: Timeout of a single request in seconds
+        """
+        self.id = f"batch_{uuid.uuid4().hex}"
+        self.input_path = input_path
+        self.output_path = output_path
+        self.backends = backends
+        self.default_model = default_model
+        self.concurrency = max(1, concurrency)
+        self.model_concurrency = model_concurrency or {}
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.total = 0
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._model_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._backend_load = {backend: 0 for backend in backends}
+        self._output = None
+
+    def _completed_ids(self) -> set:
+        """Read the custom IDs that already have a result in the output file"""
+        done = set()
+        if not os.path.exists(self.output_path):
+            return done
+        with open(self.output_path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    custom_id = record["custom_id"]
+                    retryable = record.get("error") is not None and record["response"]["status_code"] >= 500
+                except (ValueError, KeyError, TypeError):
+                    # A crash can leave a truncated last line behind
+                    continue
+                if retryable:
+                    done.discard(custom_id)
+                else:
+                    done.add(custom_id)
+        return done
+
+    def _iter_requests(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        with open(self.input_path) as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield parse_batch_line(json.loads(line), line_number, self.default_model)
+                except (ValueError, AttributeError) as e:
+                    # Malformed lines get an error result instead of failing the whole batch
+                    yield f"line-{line_number}", {"error": f"Invalid request on line {line_number}: {e}"}
+
+    def _model_slot(self, model: str) -> Optional[threading.BoundedSemaphore]:
+        if model not in self.model_concurrency:
+            return None
+        with self._lock:
+            return self._model_slots.setdefault(model, threading.BoundedSemaphore(self.model_concurrency[model]))
+
+    def _pick_backend(self) -> str:
+        """Pick the least loaded backend"""
+        with self._lock:
+            backend = min(self._backend_load, key=self._backend_load.get)
+            self._backend_load[backend] += 1
+            return backend
+
+    def _release_backend(self, backend: str):
+        with self._lock:
+            self._backend_load[backend] -= 1
+
+    def _send(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            backend = self._pick_backend()
+            try:
+                response = requests.post(f"{backend}/api/chat", json=request, timeout=self.timeout)
+                if response.status_code == 200:
+                    try:
+                        return {"status_code": 200, "body": response.json()}
+                    except ValueError:
+                        last_error = f"{backend} returned an invalid response: {response.text[:200]}"
+                elif response.status_code < 500:
+                    return {"status_code": response.status_code, "error": response.text}
+                else:
+                    last_error = f"{backend} returned {response.status_code}: {response.text}"
+            except requests.exceptions.RequestException as e:
+                last_error = f"Error communicating with {backend}: {e}"
+            finally:
+                self._release_backend(backend)
+            if attempt < self.max_retries:
+                time.sleep(min(2 ** attempt, 10))
+        return {"status_code": 502, "error": last_error}
+
+    def _process(self, custom_id: str, request: Dict[str, Any], model_slot: Optional[threading.BoundedSemaphore]):
+        try:
+            record = {"id": f"batch_req_{uuid.uuid4().hex}", "custom_id": custom_id}
+            try:
+                result = {"status_code": 400, **request} if "error" in request else self._send(request)
+                if "body" in result:
+                    completion = to_openai_completion(result["body"])
+                    result = {"status_code": 200, "body": completion}
+            except Exception as e:
+                # Unexpected responses still get a result line, so the request is accounted for
+                logger.error(f"Batch {self.id} failed to process {custom_id}: {e}")
+                result = {"status_code": 502, "error": f"Invalid response: {e}"}
+            if "body" in result:
+                record["response"] = result
+                record["error"] = None
+            else:
+                record["response"] = {"status_code": result["status_code"], "body": None}
+                record["error"] = {"code": str(result["status_code"]), "message": result["error"]}
+
+            line = json.dumps(record) + "\n"
+            with self._lock:
+                self._output.write(line)
+                self._output.flush()
+                self.completed += 1
+                if record["error"]:
+                    self.failed += 1
+                else:
+                    self.prompt_tokens += completion["usage"]["prompt_tokens"]
+                    self.completion_tokens += completion["usage"]["completion_tokens"]
+                if self.completed % 1000 == 0:
+                    logger.info(f"Batch {self.id} progress: {self.completed + self.skipped}/{self.total}, "
+                                f"{self.to_dict()['throughput']}")
+        except Exception as e:
+            logger.error(f"Batch {self.id} failed to process {custom_id}: {e}")
+        finally:
+            if model_slot is not None:
+                model_slot.release()
+            self._slots.release()
+
+    def run(self):
+        """Process the batch, blocking until every request has a result or the job is cancelled"""
+        self.status = "in_progress"
+        self.started_at = time.time()
+        try:
+            done = self._completed_ids()
+            self.skipped = len(done)
+            with open(self.input_path) as f:
+                self.total = sum(1 for line in f if line.strip())
+            if self.skipped:
+                logger.info(f"Batch {self.id} resuming, {self.skipped} of {self.total} requests already done")
+
+            self._output = open(self.output_path, "a")
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="napier-batch") as executor:
+                for custom_id, request in self._iter_requests():
+                    if self._cancelled.is_set():
+                        break
+                    if custom_id in done:
+                        continue
+                    # Acquire the slots before submitting so that memory stays bounded for huge inputs
+                    self._slots.acquire()
+                    model_slot = self._model_slot(request.get("model"))
+                    if model_slot is not None:
+                        model_slot.acquire()
+                    executor.submit(self._process, custom_id, request, model_slot)
+            self.status = "cancelled" if self._cancelled.is_set() else "completed"
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            logger.error(f"Batch {self.id} failed: {e}")
+        finally:
+            if self._output is not None:
+                self._output.close()
+            self.finished_at = time.time()
+            logger.info(f"Batch {self.id} {self.status}: {self.to_dict()['throughput']}")
+
+    def start(self) -> threading.Thread:
+        """Run the batch in a background thread"""
+        thread = threading.Thread(target=self.run, name=f"napier-{self.id}", daemon=True)
+        thread.start()
+        return thread
+
+    def cancel(self):
+        """Stop submitting requests; requests already in flight still finish"""
+        self._cancelled.set()
+        if self.status in ("queued", "in_progress"):
+            self.status = "cancelling"
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = ((self.finished_at or time.time()) - self.started_at) if self.started_at else 0
+        return {
+            "id": self.id,
+            "object": "batch",
+            "status": self.status,
+            "error": self.error,
+            "input_file": self.input_path,
+            "output_file": self.output_path,
+            "created_at": int(self.created_at),
+            "request_counts": {
+                "total": self.total,
+                "completed": self.completed + self.skipped,
+                "failed": self.failed,
+            },
+            "throughput": {
+                "elapsed_seconds": round(elapsed, 3),
+                "requests_per_second": round(self.completed / elapsed, 3) if elapsed else 0.0,
+                "tokens_per_second": round(self.completion_tokens / elapsed, 3) if elapsed else 0.0,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            },
+        }
+
+
+class BatchManager:
+    """
+    Registry of the batch jobs running on the host
+    """
+    def __init__(self, batch_config: Dict[str, Any], default_model: str, ollama_url: str):
+        self.batch_config = batch_config
+        self.default_model = default_model
+        self.ollama_url = ollama_url
+        # Input and output files are confined to this directory, since API clients choose their names
+        self.directory = os.path.realpath(batch_config.get("directory", "data/batches"))
+        self.jobs: Dict[str, BatchJob] = {}
+
+    def resolve(self, path: str) -> str:
+        """
+        Resolve a file name relative to the batch directory
+
+        Raises:
+            ValueError: If the path is absolute or leads outside the batch directory
+        """
+        if not path or os.path.isabs(path) or ".." in path.replace("\\", "/").split("/"):
+            raise ValueError(f"Batch files must be relative paths inside the batch directory: {path}")
+        resolved = os.path.realpath(os.path.join(self.directory, path))
+        if os.path.commonpath([resolved, self.directory]) != self.directory:
+            raise ValueError(f"Batch file {path} is outside the batch directory")
+        return resolved
+
+    def create(self, input_path: str, output_path: Optional[str] = None, concurrency: Optional[int] = None,
+               model_concurrency: Optional[Dict[str, int]] = None) -> BatchJob:
+        """
+        Create and start a batch job
+
+        Args:
+            input_path: Input JSONL file, relative to the batch directory
+            output_path: Output JSONL file, relative to the batch directory; an existing file is resumed
+            concurrency: Overrides the configured overall concurrency
+            model_concurrency: Overrides the configured per-model concurrency
+
+        Returns:
+            BatchJob: The started job
+
+        Raises:
+            ValueError: If a path leads outside the batch directory
+            FileNotFoundError: If the input file does not exist
+        """
+        if output_path is None:
+            output_path = f"{os.path.splitext(input_path)[0]}.output.jsonl"
+        name = input_path
+        input_path, output_path = self.resolve(input_path), self.resolve(output_path)
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file {name} not found")
+
+        job = BatchJob(
+            input_path,
+            output_path,
+            backends=self.batch_config.get("backends") or [self.ollama_url],
+            default_model=self.default_model,
+            concurrency=concurrency or self.batch_config.get("concurrency", 4),
+            model_concurrency=model_concurrency or self.batch_config.get("model_concurrency", {}),
+            max_retries=self.batch_config.get("max_retries", 2),
+            timeout=self.batch_config.get("timeout", 600)
+        )
+        self.jobs[job.id] = job
+        job.start()
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        return self.jobs.get(job_id)
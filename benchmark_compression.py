@@ -0,0 +1,88 @@
+import argparse
+import json
+import random
+import time
+
+from compression import available_encodings, encode
+
+# Benchmark bytes on wire and latency of MCP Host API responses with and without compression.
+#
+#   python benchmark_compression.py                        # synthetic payloads, codecs only
+#   python benchmark_compression.py --url http://host:8000 # live host, measured per encoding
+
+
+def synthetic_payloads(seed=0):
+    """Build payloads shaped like the API's largest responses"""
+    rng = random.Random(seed)
+    words = ["tool", "result", "file", "model", "session", "context", "error", "value", "list", "agent",
+             "the", "a", "of", "and", "to", "in", "for", "with", "on", "is"]
+
+    def sentence(n):
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    tools = [{"id": f"tool-{i}", "name": f"Tool {i}", "url": f"http://localhost:{9000 + i}",
+              "actions": [{"name": f"action_{j}", "description": sentence(12)} for j in range(8)]}
+             for i in range(50)]
+    history = [{"role": "user" if i % 2 == 0 else "assistant", "content": sentence(rng.randint(10, 200))}
+               for i in range(200)]
+    rows = [{"path": f"/data/{rng.randrange(10**6)}.txt", "size": rng.randrange(10**7),
+             "modified": 1700000000 + rng.randrange(10**7), "summary": sentence(20)} for _ in range(2000)]
+    return {
+        "GET /tools": json.dumps({"tools": tools}).encode("utf-8"),
+        "POST /chat (200 message session)": json.dumps({"model": "llama3", "messages": history}).encode("utf-8"),
+        "tool result (2000 rows)": json.dumps({"result": rows}).encode("utf-8"),
+    }
+
+
+def benchmark_codecs(mbps, repeat):
+    print(f"Codec benchmark, transfer time at {mbps} Mbit/s")
+    print(f"{'payload':36} {'encoding':8} {'bytes':>10} {'ratio':>7} {'encode ms':>10} {'transfer ms':>12}")
+    for name, payload in synthetic_payloads().items():
+        print(f"{name:36} {'identity':8} {len(payload):>10} {1.0:>7.2f} {0.0:>10.2f} "
+              f"{len(payload) * 8 / (mbps * 1000):>12.2f}")
+        for encoding in available_encodings():
+            started = time.perf_counter()
+            for _ in range(repeat):
+                compressed = encode(encoding, payload)
+            encode_ms = (time.perf_counter() - started) * 1000 / repeat
+            print(f"{'':36} {encoding:8} {len(compressed):>10} {len(payload) / len(compressed):>7.2f} "
+                  f"{encode_ms:>10.2f} {len(compressed) * 8 / (mbps * 1000):>12.2f}")
+
+
+def benchmark_host(url, paths, repeat):
+    import requests
+
+    url = url.rstrip("/")
+    print(f"Live benchmark against {url}")
+    print(f"{'request':24} {'encoding':8} {'bytes on wire':>14} {'median ms':>10}")
+    for path in paths:
+        for accept in ["identity"] + available_encodings():
+            timings = []
+            wire_bytes = 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = requests.get(url + path, stream=True, headers={"Accept-Encoding": accept})
+                wire_bytes = len(response.raw.read(decode_content=False))
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            used = response.headers.get("Content-Encoding", "identity")
+            print(f"{'GET ' + path:24} {used:8} {wire_bytes:>14} {timings[len(timings) // 2]:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compression of MCP Host API payloads")
+    parser.add_argument("--url", help="Base URL of a running MCP Host to measure end to end")
+    parser.add_argument("--paths", nargs="+", default=["/tools", "/cache", "/limits"],
+                        help="GET endpoints measured in live mode, e.g. /sessions/<id> or /v1/batches")
+    parser.add_argument("--mbps", type=float, default=100, help="Link speed used to estimate transfer time")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement")
+    args = parser.parse_args()
+
+    if args.url:
+        benchmark_host(args.url, args.paths, args.repeat)
+    else:
+        benchmark_codecs(args.mbps, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import logging
+import threading
+import httpx
+from typing import Dict, Any, Tuple
+
+logger = logging.getLogger("napier.chat_streams")
+
+
+class StreamCancelled(Exception):
+    """
+    Raised inside a generation when its stream was cancelled by the client
+    """
+
+
+class StreamStalled(StreamCancelled):
+    """
+    Raised inside a generation when the client granted no credits before the deadline
+    """
+
+
+class ChatStream:
+    """
+    One chat generation multiplexed with others over a single WebSocket connection
+
+    Frames are sent against a credit window granted by the client. A generation
+    that runs out of credits waits on the event loop, which stops reading from
+    Ollama, so a slow consumer throttles generation upstream instead of piling
+    frames up in memory. A client that grants no credits before the credit
+    timeout stalls the stream, which is then aborted.
+    """
+    def __init__(self, stream_id: str, outgoing: asyncio.Queue, loop: asyncio.AbstractEventLoop,
+                 window: int = 32, credit_timeout: float = 60.0):
+        """
+        Initialize the stream
+
+        Args:
+            stream_id: Client-chosen ID tagging every frame of the stream
+            outgoing: Queue of frames written to the WebSocket
+            loop: Event loop serving the WebSocket
+            window: Initial number of frames the stream may send before the client grants more credits
+            credit_timeout: Seconds a frame may wait for a credit before the stream is aborted
+        """
+        self.stream_id = stream_id
+        self.outgoing = outgoing
+        self.loop = loop
+        self.credits = window
+        self.credit_timeout = credit_timeout
+        self.cancelled = threading.Event()
+        self._credit_changed = asyncio.Condition()
+
+    async def grant(self, credits: int):
+        """Allow the stream to send more frames"""
+        async with self._credit_changed:
+            self.credits += credits
+            self._credit_changed.notify_all()
+
+    async def cancel(self):
+        """Stop the stream; its generation aborts at the next frame"""
+        self.cancelled.set()
+        async with self._credit_changed:
+            self._credit_changed.notify_all()
+
+    async def send(self, frame: Dict[str, Any]):
+        """Send a frame once a credit is available"""
+        async with self._credit_changed:
+            try:
+                await asyncio.wait_for(
+                    self._credit_changed.wait_for(lambda: self.credits > 0 or self.cancelled.is_set()),
+                    self.credit_timeout
+                )
+            except asyncio.TimeoutError:
+                self.cancelled.set()
+                raise StreamStalled(f"No credits granted within {self.credit_timeout}s")
+            if self.cancelled.is_set():
+                raise StreamCancelled()
+            self.credits -= 1
+        await self.outgoing.put({"stream_id": self.stream_id, **frame})
+
+    async def send_final(self, frame: Dict[str, Any]):
+        """Send the closing frame of the stream, which does not need a credit"""
+        await self.outgoing.put({"stream_id": self.stream_id, **frame})
+
+    def send_from_thread(self, frame: Dict[str, Any]):
+        """
+        Send a frame from a worker thread, blocking while the stream has no credits
+
+        The wait is bounded by the credit timeout, so a stalled client cannot
+        hold the worker thread indefinitely.
+        """
+        if self.cancelled.is_set():
+            raise StreamCancelled()
+        asyncio.run_coroutine_threadsafe(self.send(frame), self.loop).result()
+
+
+async def generate_chat(stream: ChatStream, ollama_url: str, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Stream a chat completion from Ollama into a ChatStream
+
+    Ollama is read asynchronously, so waiting for credits never occupies a
+    worker thread. Leaving this coroutine, including by task cancellation,
+    closes the connection to Ollama, which stops the generation upstream.
+
+    Args:
+        stream: Stream receiving "delta" frames
+        ollama_url: Base URL of the Ollama server
+        payload: Ollama chat request
+
+    Returns:
+        Tuple of the complete assistant message and Ollama's final chunk with timing and token counts
+
+    Raises:
+        StreamCancelled: If the client cancelled the stream or stalled it
+        RuntimeError: If Ollama rejected the request
+        httpx.HTTPError: If Ollama cannot be reached
+    """
+    content = []
+    final: Dict[str, Any] = {}
+    async with httpx.AsyncClient(timeout=httpx.Timeout(None, connect=10)) as client:
+        async with client.stream("POST", f"{ollama_url}/api/chat", json={**payload, "stream": True}) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise RuntimeError(f"Ollama returned {response.status_code}: {response.text}")
+            async for line in response.aiter_lines():
+                if stream.cancelled.is_set():
+                    raise StreamCancelled()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                delta = chunk.get("message", {}).get("content", "")
+                if delta:
+                    content.append(delta)
+                    await stream.send({"type": "delta", "content": delta})
+                if chunk.get("done"):
+                    final = chunk
+    return {"role": "assistant", "content": "".join(content)}, final
@@ -0,0 +1,293 @@
+import io
+import json
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content types that are already compressed and not worth compressing again
+INCOMPRESSIBLE_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip",
+                        "application/zstd", "application/octet-stream")
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync flush so every chunk of a streamed response is decodable on arrival
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+# Encoders in order of server preference, with the default level used for streamed chunks
+ENCODERS = {"gzip": (_GzipEncoder, 6)}
+if brotli is not None:
+    ENCODERS = {"br": (_BrotliEncoder, 4), **ENCODERS}
+if zstandard is not None:
+    ENCODERS = {"zstd": (_ZstdEncoder, 3), **ENCODERS}
+
+
+def available_encodings() -> List[str]:
+    """Return the supported content encodings, most preferred first"""
+    return list(ENCODERS)
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Pick the content encoding for a response from an Accept-Encoding header
+
+    Args:
+        accept_encoding: Value of the request's Accept-Encoding header
+        encodings: Candidate encodings in order of server preference
+
+    Returns:
+        Optional[str]: The chosen encoding, or None to send the body uncompressed
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encodings or available_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def encode(encoding: str, data: bytes, level: Optional[int] = None) -> bytes:
+    """Compress a complete body with the given content encoding"""
+    encoder_class, default_level = ENCODERS[encoding]
+    encoder = encoder_class(default_level if level is None else level)
+    return encoder.compress(data) + encoder.finish()
+
+
+def decode(encoding: str, data: bytes, max_size: int) -> bytes:
+    """
+    Decompress a request body
+
+    Raises:
+        ValueError: If the encoding is unsupported, the body is corrupt or it expands beyond max_size
+    """
+    encoding = encoding.strip().lower()
+    # Brotli is only used for responses: its decoder cannot cap the output size
+    if encoding not in ("gzip", "deflate") and (encoding not in ENCODERS or encoding == "br"):
+        raise ValueError(f"Unsupported content encoding {encoding}")
+    errors = (zlib.error,)
+    if zstandard is not None:
+        errors += (zstandard.ZstdError,)
+    try:
+        # Output is capped at max_size + 1 bytes, so a small compressed body
+        # cannot expand into an unbounded allocation
+        if encoding in ("gzip", "deflate"):
+            wbits = 16 + zlib.MAX_WBITS if encoding == "gzip" else zlib.MAX_WBITS
+            decompressor = zlib.decompressobj(wbits)
+            body = decompressor.decompress(data, max_size + 1)
+            # A gzip body may be several members back to back, each with its own header
+            while encoding == "gzip" and decompressor.eof and decompressor.unused_data and len(body) <= max_size:
+                rest = decompressor.unused_data
+                decompressor = zlib.decompressobj(wbits)
+                body += decompressor.decompress(rest, max_size + 1 - len(body))
+            if len(body) <= max_size and not decompressor.eof:
+                raise ValueError(f"Corrupt {encoding} body: truncated")
+            if len(body) <= max_size and decompressor.unused_data:
+                raise ValueError(f"Corrupt {encoding} body: trailing data")
+        else:
+            # Read across frames so a body of several zstd frames is decoded whole
+            reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True)
+            body = reader.read(max_size + 1)
+    except errors as e:
+        raise ValueError(f"Corrupt {encoding} body: {e}")
+    if len(body) > max_size:
+        raise ValueError(f"Decompressed body exceeds {max_size} bytes")
+    return body
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware negotiating compressed request and response bodies
+
+    Responses with a single body are compressed when they reach minimum_size.
+    Streamed responses (NDJSON job events, chunked tool results, streaming chat)
+    are compressed chunk by chunk with a flush after each one, so clients still
+    see every chunk as soon as it is produced. WebSocket traffic is untouched.
+    """
+    def __init__(self, app, minimum_size: int = 1024, max_request_size: int = 64 * 1024 * 1024,
+                 encodings: Optional[List[str]] = None):
+        """
+        Initialize the middleware
+
+        Args:
+            app: ASGI application to wrap
+            minimum_size: Smallest single-body response that is compressed
+            max_request_size: Largest accepted request body after decompression
+            encodings: Encodings offered to clients in order of preference, defaults to all available
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.max_request_size = max_request_size
+        self.encodings = [e for e in (encodings or available_encodings()) if e in ENCODERS]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = scope.get("headers", [])
+        content_encoding = _header(headers, b"content-encoding")
+        if content_encoding and content_encoding.lower() != "identity":
+            receive = await self._decompressed_receive(content_encoding, receive, send)
+            if receive is None:
+                return
+
+        encoding = negotiate_encoding(_header(headers, b"accept-encoding") or "", self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.minimum_size))
+
+    async def _decompressed_receive(self, content_encoding, receive, send):
+        """Read and decompress the whole request body, or answer with an error and return None"""
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            more_body = message.get("more_body", False)
+            if size > self.max_request_size:
+                await _send_error(send, 413, "Request body too large")
+                return None
+        try:
+            body = decode(content_encoding, b"".join(chunks), self.max_request_size)
+        except ValueError as e:
+            status = 415 if str(e).startswith("Unsupported") else 413 if "exceeds" in str(e) else 400
+            await _send_error(send, status, str(e))
+            return None
+
+        delivered = False
+
+        async def decompressed_receive():
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return decompressed_receive
+
+
+class _CompressingSender:
+    def __init__(self, send, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            headers = message.get("headers", [])
+            content_type = _header(headers, b"content-type") or ""
+            # Bodies that are already encoded or compressed pass through untouched
+            if _header(headers, b"content-encoding") or content_type.startswith(INCOMPRESSIBLE_TYPES):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                self.start_message = message
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if not more_body and len(body) < self.minimum_size:
+                await self.send(start)
+                await self.send(message)
+                self.passthrough = True
+                return
+            encoder_class, level = ENCODERS[self.encoding]
+            self.encoder = encoder_class(level)
+            headers = [(k, v) for k, v in start.get("headers", []) if k.lower() != b"content-length"]
+            headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+            headers.append((b"vary", b"Accept-Encoding"))
+            if not more_body:
+                compressed = self.encoder.compress(body) + self.encoder.finish()
+                headers.append((b"content-length", str(len(compressed)).encode("latin-1")))
+                await self.send({**start, "headers": headers})
+                await self.send({"type": "http.response.body", "body": compressed, "more_body": False})
+                return
+            await self.send({**start, "headers": headers})
+
+        if more_body:
+            await self.send({"type": "http.response.body", "body": self.encoder.compress(body), "more_body": True})
+        else:
+            await self.send({"type": "http.response.body",
+                             "body": self.encoder.compress(body) + self.encoder.finish(), "more_body": False})
+
+
+async def _send_error(send, status: int, detail: str):
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode("latin-1"))]})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,276 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import logging
+import threading
+import requests
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger("napier.embeddings")
+
+
+class EmbeddingBatcher:
+    """
+    Collects concurrent embedding requests into micro-batches sent to Ollama's /api/embed
+    """
+    def __init__(self, ollama_url: str = "http://localhost:11434", max_batch_size: int = 32,
+                 max_wait_ms: float = 10, cache_size: int = 10000, timeout: float = 60):
+        """
+        Initialize the batcher
+
+        Args:
+            ollama_url: Base URL of the Ollama server
+            max_batch_size: Maximum number of texts per request to Ollama
+            max_wait_ms: Maximum time a text waits for its batch to fill up
+            cache_size: Maximum number of embeddings cached by content hash
+            timeout: Seconds to wait for Ollama to answer a batch
+        """
+        self.ollama_url = ollama_url.rstrip("/")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        # The cache is shared by the event loops of every API server thread
+        self._cache_lock = threading.Lock()
+        self._queues: Dict[tuple, asyncio.Queue] = {}
+        self._workers: Dict[tuple, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[List[float]]:
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+            return embedding
+
+    def _cache_put(self, key: str, embedding: List[float]):
+        with self._cache_lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _request(self, model: str, texts: List[str]) -> List[List[float]]:
+        response = requests.post(f"{self.ollama_url}/api/embed", json={"model": model, "input": texts},
+                                 timeout=self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"Ollama returned {response.status_code}: {response.text}")
+        return response.json()["embeddings"]
+
+    async def _worker(self, model: str, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Identical texts that arrive in the same batch are embedded once
+            unique_texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                embeddings = await loop.run_in_executor(None, self._request, model, unique_texts)
+                by_text = dict(zip(unique_texts, embeddings))
+                for text, future in batch:
+                    self._cache_put(self._key(model, text), by_text[text])
+                    if not future.done():
+                        future.set_result(by_text[text])
+            except Exception as e:
+                logger.error(f"Embedding batch of {len(unique_texts)} texts for {model} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def embed(self, model: str, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, serving cached embeddings directly and batching the rest with concurrent requests
+
+        Args:
+            model: Ollama embedding model
+            texts: Texts to embed
+
+        Returns:
+            List[List[float]]: One embedding per text, in order
+        """
+        loop = asyncio.get_running_loop()
+        # Queues belong to an event loop, and the host may serve the API from several loops
+        queue_key = (id(loop), model)
+        if queue_key not in self._queues:
+            self._queues[queue_key] = asyncio.Queue()
+            self._workers[queue_key] = loop.create_task(self._worker(model, self._queues[queue_key]))
+        queue = self._queues[queue_key]
+
+        results: List[Any] = []
+        for text in texts:
+            cached = self._cache_get(self._key(model, text))
+            if cached is not None:
+                results.append(cached)
+            else:
+                future = loop.create_future()
+                queue.put_nowait((text, future))
+                results.append(future)
+        return [await r if isinstance(r, asyncio.Future) else r for r in results]
+
+
+class VectorIndex:
+    """
+    Append-only vector index stored as a memory-mapped float32 matrix with a JSONL metadata sidecar
+
+    Vectors are normalized on insert, so top-k search is a single
+    matrix-vector product over the memory map.
+    """
+    def __init__(self, directory: str, name: str):
+        """
+        Open or create an index
+
+        Args:
+            directory: Directory holding the index files
+            name: Index name
+
+        Raises:
+            RuntimeError: If numpy is not installed
+            ValueError: If the name is not a plain identifier
+        """
+        if np is None:
+            raise RuntimeError("numpy is required for vector indexes")
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", name):
+            raise ValueError(f"Invalid index name {name}")
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.name = name
+        self.vectors_path = os.path.join(directory, f"{name}.f32")
+        self.metadata_path = os.path.join(directory, f"{name}.meta.jsonl")
+        self.header_path = os.path.join(directory, f"{name}.json")
+        self.dim: Optional[int] = None
+        self.entries: List[Dict[str, Any]] = []
+        self._matrix = None
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.header_path):
+            with open(self.header_path) as f:
+                self.dim = json.load(f)["dim"]
+            self._recover()
+            self._remap()
+
+    def _recover(self):
+        """
+        Bring the vector and metadata files back in line after an interrupted add
+
+        Vectors are appended before their metadata, so a crash can leave vector
+        rows without an entry or a partially written last metadata line. Both
+        files are truncated to the entries that were completely written.
+        """
+        entries = []
+        # Byte offset in the metadata file where each entry ends
+        ends = [0]
+        if os.path.exists(self.metadata_path):
+            with open(self.metadata_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        break
+                    ends.append(ends[-1] + len(line))
+        row_size = 4 * self.dim
+        vectors_size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        entries = entries[:vectors_size // row_size]
+
+        if vectors_size != len(entries) * row_size:
+            logger.warning(f"Dropping {vectors_size // row_size - len(entries)} vectors without metadata "
+                           f"from index {self.name}")
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(len(entries) * row_size)
+        if os.path.exists(self.metadata_path) and os.path.getsize(self.metadata_path) != ends[len(entries)]:
+            with open(self.metadata_path, "r+b") as f:
+                f.truncate(ends[len(entries)])
+        self.entries = entries
+
+    def _remap(self):
+        if self.entries:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.entries), self.dim))
+
+    def add(self, ids: List[str], vectors: List[List[float]], metadata: Optional[List[Dict[str, Any]]] = None):
+        """
+        Append vectors to the index
+
+        Args:
+            ids: ID of each vector
+            vectors: Vectors to add
+            metadata: Optional metadata stored with each vector
+
+        Raises:
+            ValueError: If the vectors do not match the index dimension or the ids and metadata
+        """
+        if len(vectors) != len(ids) or (metadata is not None and len(metadata) != len(ids)):
+            raise ValueError("ids, vectors and metadata must have the same length")
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or (self.dim is not None and matrix.shape[1] != self.dim):
+            raise ValueError(f"Vectors must have dimension {self.dim}")
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms == 0, 1, norms)
+        metadata = metadata or [{} for _ in ids]
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = matrix.shape[1]
+                with open(self.header_path, "w") as f:
+                    json.dump({"name": self.name, "dim": self.dim}, f)
+            with open(self.vectors_path, "ab") as f:
+                f.write(matrix.tobytes())
+            new_entries = [{"id": i, "metadata": m} for i, m in zip(ids, metadata)]
+            with open(self.metadata_path, "a") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in new_entries)
+            self.entries.extend(new_entries)
+            self._remap()
+
+    def search(self, vector: List[float], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find the k most similar vectors by cosine similarity
+
+        Args:
+            vector: Query vector
+            k: Number of results
+
+        Returns:
+            List[Dict[str, Any]]: Results with id, score and metadata, best first
+
+        Raises:
+            ValueError: If k is not a positive integer or the vector does not match the index dimension
+        """
+        if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+            raise ValueError("k must be a positive integer")
+        with self._lock:
+            matrix, entries = self._matrix, self.entries
+        if matrix is None:
+            return []
+        try:
+            query = np.asarray(vector, dtype=np.float32)
+        except (TypeError, ValueError):
+            raise ValueError("Query vector must be a list of numbers")
+        if query.shape != (self.dim,):
+            raise ValueError(f"Query vector must have dimension {self.dim}")
+        query = query / (np.linalg.norm(query) or 1)
+        scores = matrix @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [{"id": entries[i]["id"], "score": float(scores[i]), "metadata": entries[i]["metadata"]} for i in top]
@@ -0,0 +1,139 @@
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Deque, Tuple
+
+logger = logging.getLogger("napier.jobs")
+
+
+class Job:
+    """
+    Background job with a progress event log
+    """
+    def __init__(self, kind: str, tool_id: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.tool_id = tool_id
+        self.status = "pending"
+        self.error: Optional[str] = None
+        self.events: List[Dict[str, Any]] = []
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def report(self, message: str):
+        """Record a progress message and wake up event listeners"""
+        with self._changed:
+            self.events.append({"time": time.time(), "message": message})
+            self._changed.notify_all()
+
+    def _finish(self, status: str, error: Optional[str] = None):
+        with self._changed:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+            self._changed.notify_all()
+
+    def wait_for_events(self, after: int, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Wait until there are events past index `after` or the job is done
+
+        Args:
+            after: Number of events the caller has already seen
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            List[Dict[str, Any]]: New events, possibly empty
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.events) > after or self.done, timeout=timeout)
+            return self.events[after:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "tool_id": self.tool_id,
+            "status": self.status,
+            "error": self.error,
+            "events": list(self.events),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Runs tool lifecycle jobs in a thread pool
+
+    Jobs for different tools run in parallel, while jobs for the same tool
+    run one after the other so that e.g. a stop cannot overtake a start.
+    Jobs waiting for their tool are queued rather than submitted, so they
+    do not hold pool workers that other tools' jobs could use.
+    """
+    def __init__(self, max_workers: int = 8, max_finished_jobs: int = 200):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="napier-job")
+        # Jobs waiting behind the running job of each tool; a tool has an entry while one of its jobs runs
+        self._tool_queues: Dict[str, Deque[Tuple[Job, Callable[[Job], bool]]]] = {}
+        self._lock = threading.Lock()
+        self.jobs: Dict[str, Job] = {}
+        self.max_finished_jobs = max_finished_jobs
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond the retention limit"""
+        finished = [job for job in self.jobs.values() if job.done]
+        for job in sorted(finished, key=lambda j: j.finished_at)[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job.id]
+
+    def _run(self, job: Job, fn: Callable[[Job], bool]):
+        job.status = "running"
+        try:
+            success = fn(job)
+            job._finish("succeeded" if success else "failed",
+                        None if success else f"{job.kind} of {job.tool_id} failed")
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind} {job.tool_id}) failed: {e}")
+            job._finish("failed", str(e))
+        finally:
+            # Hand the tool over to its next queued job
+            with self._lock:
+                queue = self._tool_queues[job.tool_id]
+                next_job = queue.popleft() if queue else None
+                if next_job is None:
+                    del self._tool_queues[job.tool_id]
+            if next_job is not None:
+                self._executor.submit(self._run, *next_job)
+
+    def submit(self, kind: str, tool_id: str, fn: Callable[[Job], bool]) -> Job:
+        """
+        Submit a job
+
+        Args:
+            kind: Job kind, e.g. "start" or "install"
+            tool_id: Tool the job operates on
+            fn: Function doing the work; receives the job for progress reports and returns success
+
+        Returns:
+            Job: The submitted job
+        """
+        job = Job(kind, tool_id)
+        with self._lock:
+            self._prune()
+            self.jobs[job.id] = job
+            if tool_id in self._tool_queues:
+                self._tool_queues[tool_id].append((job, fn))
+                return job
+            self._tool_queues[tool_id] = deque()
+
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
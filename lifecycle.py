@@ -0,0 +1,117 @@
+import json
+import threading
+import time
+import logging
+from typing import Callable, List
+
+logger = logging.getLogger("napier.lifecycle")
+
+
+class RequestDrainer:
+    """
+    ASGI middleware counting in-flight requests so the host can shut down gracefully
+
+    Once draining starts, new HTTP requests are answered with 503 and new
+    WebSocket connections are refused, while requests already being served
+    run to completion. Long-lived handlers such as WebSocket connections
+    register with on_drain to be told to wind down instead of holding the
+    shutdown until its timeout.
+    """
+    def __init__(self, app):
+        """
+        Initialize the middleware
+
+        Args:
+            app: ASGI application to wrap
+        """
+        self.app = app
+        self.draining = False
+        self.in_flight = 0
+        self._idle = threading.Condition()
+        self._drain_callbacks: List[Callable[[], None]] = []
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        if self.draining:
+            await self._refuse(scope, receive, send)
+            return
+
+        with self._idle:
+            self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            with self._idle:
+                self.in_flight -= 1
+                if self.in_flight == 0:
+                    self._idle.notify_all()
+
+    async def _refuse(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            await receive()
+            # 1012: service restart
+            await send({"type": "websocket.close", "code": 1012})
+            return
+        body = json.dumps({"detail": "NAPIER is shutting down"}).encode("utf-8")
+        await send({"type": "http.response.start", "status": 503,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode("latin-1")),
+                                (b"retry-after", b"5"),
+                                (b"connection", b"close")]})
+        await send({"type": "http.response.body", "body": body})
+
+    def on_drain(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Register a callback run once draining starts, or right away if it already has
+
+        The callback runs on the thread that starts draining, so handlers on an
+        event loop should hand it over with call_soon_threadsafe.
+
+        Returns:
+            Callable[[], None]: Function unregistering the callback
+        """
+        with self._idle:
+            if not self.draining:
+                self._drain_callbacks.append(callback)
+                return lambda: self._remove_drain_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_drain_callback(self, callback):
+        with self._idle:
+            if callback in self._drain_callbacks:
+                self._drain_callbacks.remove(callback)
+
+    def start_draining(self):
+        """Refuse new requests from now on and tell long-lived handlers to finish"""
+        with self._idle:
+            self.draining = True
+            callbacks, self._drain_callbacks = self._drain_callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Drain callback failed: {e}")
+
+    def wait_idle(self, timeout: float) -> bool:
+        """
+        Wait for in-flight requests to finish
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            bool: True if no requests are in flight, False if the deadline passed first
+        """
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self.in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Shutting down with {self.in_flight} requests still in flight")
+                    return False
+                self._idle.wait(remaining)
+        return True
@@ -1,11 +1,320 @@
 import json
 import requests
 import os
+import time
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import tempfile
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import CancelledError, TimeoutError
+from typing import Dict, List, Any, Optional, Callable, Iterator, IO
+
+from napier_logging import HOT_PATH
+from transports import JSONRPCError, create_transport
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger("napier.mcp")
 
+
+def json_dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    separators = (",", ":")
+    return json.dumps(obj, default=str, sort_keys=sort_keys, separators=separators).encode("utf-8")
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for the calls to a single MCP tool
+    
+    The limit grows by one per window of successful calls while latency stays
+    within a tolerance of the observed baseline, and is cut multiplicatively
+    on errors or latency spikes. Each action has its own baseline, the median
+    of its recent latencies, so a slow action is not mistaken for overload
+    of a fast one. Calls over the limit queue until a slot frees up or their
+    deadline passes.
+    """
+    def __init__(self, initial_limit: int = 4, min_limit: int = 1, max_limit: int = 64,
+                 latency_tolerance: float = 2.0, backoff: float = 0.5, queue_timeout: float = 30.0,
+                 latency_window: int = 50, min_samples: int = 5):
+        """
+        Initialize the limiter
+        
+        Args:
+            initial_limit: Starting concurrency limit
+            min_limit: Lowest limit the backoff can reach
+            max_limit: Highest limit the increase can reach
+            latency_tolerance: Latency above baseline times this factor counts as overload
+            backoff: Factor applied to the limit on overload
+            queue_timeout: Seconds a call may wait in the queue before it fails
+            latency_window: Number of recent successful calls per action the baseline is taken from
+            min_samples: Calls of an action needed before its latency can signal overload
+        """
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self.latency_window = latency_window
+        self.min_samples = min_samples
+        self._latencies: Dict[str, deque] = {}
+        self._last_backoff = 0.0
+        self._available = threading.Condition()
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a free slot
+        
+        Args:
+            timeout: Deadline in seconds, defaults to the queue timeout
+            
+        Returns:
+            bool: True if a slot was acquired, False if the deadline passed
+        """
+        with self._available:
+            self.queued += 1
+            try:
+                acquired = self._available.wait_for(lambda: self.in_flight < int(self.limit),
+                                                    timeout=self.queue_timeout if timeout is None else timeout)
+            finally:
+                self.queued -= 1
+            if not acquired:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+    
+    def _baseline(self, action: str) -> Optional[float]:
+        latencies = self._latencies.get(action)
+        if not latencies or len(latencies) < self.min_samples:
+            return None
+        return sorted(latencies)[len(latencies) // 2]
+    
+    def release(self, latency: float, error: bool = False, action: str = ""):
+        """
+        Free a slot and adapt the limit to the outcome of the call
+        
+        Args:
+            latency: Duration of the call in seconds
+            error: Whether the call failed
+            action: Action that was called, whose latency baseline the call is compared with
+        """
+        with self._available:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            now = time.monotonic()
+            baseline = self._baseline(action)
+            
+            overloaded = error or (baseline is not None and latency > baseline * self.latency_tolerance)
+            if overloaded:
+                # Back off at most once per baseline latency so that one burst of failures counts once
+                if now - self._last_backoff > (baseline or 0):
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_backoff = now
+            elif saturated:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            
+            if not error:
+                self._latencies.setdefault(action, deque(maxlen=self.latency_window)).append(latency)
+            self._available.notify_all()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._available:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "rejected": self.rejected,
+                "baseline_latency_ms": {
+                    action: round(baseline * 1000, 1)
+                    for action, baseline in ((action, self._baseline(action)) for action in self._latencies)
+                    if baseline is not None
+                },
+            }
+
+
+class ActionStream:
+    """
+    Unbuffered result of an MCP action, read chunk by chunk from the tool's response
+    """
+    def __init__(self, response: requests.Response, chunk_size: int = 64 * 1024):
+        self.response = response
+        # Called once when the stream is closed, e.g. to free a concurrency slot
+        self.on_close: Optional[Callable[[], None]] = None
+        self.status_code = response.status_code
+        self.content_type = response.headers.get("content-type", "application/octet-stream")
+        # iter_content decodes compressed bodies, so the tool's length only holds for identity bodies
+        encoded = response.headers.get("content-encoding", "identity").lower() != "identity"
+        self.content_length = None if encoded else response.headers.get("content-length")
+        self.chunk_size = chunk_size
+    
+    def iter_chunks(self) -> Iterator[bytes]:
+        """Yield the response body in chunks, closing the connection when done"""
+        try:
+            for chunk in self.response.iter_content(chunk_size=self.chunk_size):
+                if chunk:
+                    yield chunk
+        finally:
+            self.close()
+    
+    def to_file(self, spool_threshold: int = 8 * 1024 * 1024) -> IO[bytes]:
+        """
+        Read the whole body into a file-like object that spills to disk above a size threshold
+        
+        Args:
+            spool_threshold: Number of bytes kept in memory before spooling to a temporary file
+            
+        Returns:
+            IO[bytes]: File-like object positioned at the start of the body
+            
+        Raises:
+            RuntimeError: If the tool answered with an error status
+        """
+        if self.status_code != 200:
+            try:
+                detail = self.response.text[:200]
+            finally:
+                self.close()
+            raise RuntimeError(f"Tool returned {self.status_code}: {detail}")
+        spool = tempfile.SpooledTemporaryFile(max_size=spool_threshold)
+        for chunk in self.iter_chunks():
+            spool.write(chunk)
+        spool.seek(0)
+        return spool
+    
+    def close(self):
+        self.response.close()
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ToolResultCache:
+    """
+    LRU cache of MCP action results keyed by tool, action and canonicalized parameters
+    """
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024, default_ttl: float = 60.0):
+        """
+        Initialize the cache
+        
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total size of the serialized cached results
+            default_ttl: TTL in seconds for actions that do not define one
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(tool_id: str, action: str, params: Optional[Dict[str, Any]]) -> tuple:
+        """Build a cache key that is independent of parameter ordering"""
+        canonical = json_dumps(params or {}, sort_keys=True)
+        return (tool_id, action, canonical)
+    
+    def _tool_stats(self, tool_id: str) -> Dict[str, int]:
+        return self._stats.setdefault(tool_id, {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0})
+    
+    def _drop(self, key: tuple):
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+    
+    def get(self, tool_id: str, action: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached result
+        
+        Returns:
+            Optional[Dict[str, Any]]: A fresh copy of the cached result, or None on a miss
+        """
+        key = self.make_key(tool_id, action, params)
+        with self._lock:
+            stats = self._tool_stats(tool_id)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            stats["hits"] += 1
+            payload = entry[1]
+        return json_loads(payload)
+    
+    def put(self, tool_id: str, action: str, params: Optional[Dict[str, Any]], result: Dict[str, Any],
+            ttl: Optional[float] = None):
+        """Store a result, evicting least recently used entries to respect the bounds"""
+        key = self.make_key(tool_id, action, params)
+        payload = json_dumps(result)
+        if len(payload) > self.max_bytes:
+            return
+        expires = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires, payload)
+            self._bytes += len(payload)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                evicted_key = next(iter(self._entries))
+                self._drop(evicted_key)
+                self._tool_stats(evicted_key[0])["evictions"] += 1
+    
+    def invalidate_tool(self, tool_id: str):
+        """Drop every cached result of a tool"""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == tool_id]
+            for key in keys:
+                self._drop(key)
+            if keys:
+                self._tool_stats(tool_id)["invalidations"] += len(keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss statistics per tool
+        
+        Returns:
+            Dict[str, Any]: Overall size of the cache and counters per tool ID
+        """
+        with self._lock:
+            entries_per_tool: Dict[str, int] = {}
+            for key in self._entries:
+                entries_per_tool[key[0]] = entries_per_tool.get(key[0], 0) + 1
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "tools": {
+                    tool_id: {**stats, "entries": entries_per_tool.get(tool_id, 0)}
+                    for tool_id, stats in self._stats.items()
+                }
+            }
+
+
 class MCPClient:
     """
     MCP Client for communicating with Model Context Protocol servers
@@ -20,7 +329,27 @@ class MCPClient:
         self.tool_id = tool_config.get("id")
         self.name = tool_config.get("name", self.tool_id)
         self.url = tool_config.get("url")
+        self.timeout = tool_config.get("timeout", 60)
         self.capabilities = tool_config.get("capabilities", [])
+        self.cache_config = tool_config.get("cache", {})
+        self._live_actions: Dict[str, Dict[str, Any]] = {}
+        # Persistent JSON-RPC transport, or None for the REST endpoints over HTTP
+        self.transport = create_transport(tool_config)
+        if self.transport is not None:
+            self.transport.on_notification("notifications/tools/list_changed", self._on_tools_changed)
+            self.transport.on_notification("notifications/message", self._on_log_message)
+    
+    def _on_tools_changed(self, params: Dict[str, Any]):
+        self._live_actions = {}
+        logger.info(f"Actions of {self.name} changed")
+    
+    def _on_log_message(self, params: Dict[str, Any]):
+        logger.debug(f"{self.name}: {params.get('data')}")
+    
+    def close(self):
+        """Close the persistent transport of the tool, if any"""
+        if self.transport is not None:
+            self.transport.close()
     
     def check_connection(self) -> bool:
         """
@@ -29,6 +358,9 @@ class MCPClient:
         Returns:
             bool: True if connection is successful, False otherwise
         """
+        if self.transport is not None:
+            return self.transport.check_connection()
+        
         if not self.url:
             logger.error(f"No URL defined for tool {self.name}")
             return False
@@ -37,13 +369,13 @@ class MCPClient:
             # MCP specification suggests tools expose a /status endpoint
             response = requests.get(f"{self.url}/status", timeout=2)
             if response.status_code == 200:
-                logger.info(f"Successfully connected to {self.name} at {self.url}")
+                logger.debug("Successfully connected to %s at %s", self.name, self.url, extra=HOT_PATH)
                 return True
             else:
-                logger.warning(f"Received status code {response.status_code} from {self.name}")
+                logger.warning("Received status code %s from %s", response.status_code, self.name, extra=HOT_PATH)
                 return False
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to connect to {self.name} at {self.url}: {e}")
+            logger.error("Failed to connect to %s at %s: %s", self.name, self.url, e, extra=HOT_PATH)
             return False
     
     def get_capabilities(self) -> List[str]:
@@ -53,6 +385,15 @@ class MCPClient:
         Returns:
             List[str]: List of capabilities
         """
+        if self.transport is not None:
+            try:
+                capabilities = self.transport.list_actions()
+            except (OSError, JSONRPCError, TimeoutError, CancelledError) as e:
+                logger.error(f"Error getting capabilities from {self.name}: {e}")
+                return self.capabilities
+            self._live_actions = {c["name"]: c for c in capabilities}
+            return capabilities
+        
         if not self.check_connection():
             return self.capabilities
         
@@ -61,6 +402,8 @@ class MCPClient:
             response = requests.get(f"{self.url}/capabilities")
             if response.status_code == 200:
                 capabilities = response.json().get("capabilities", [])
+                # Remember metadata such as cacheability that the tool reports about its actions
+                self._live_actions = {c["name"]: c for c in capabilities if isinstance(c, dict) and c.get("name")}
                 logger.info(f"Got capabilities from {self.name}: {capabilities}")
                 return capabilities
             else:
@@ -69,21 +412,107 @@ class MCPClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"Error getting capabilities from {self.name}: {e}")
             return self.capabilities
+
+    def describe_actions(self) -> List[Dict[str, Any]]:
+        """
+        Describe the actions of the MCP tool without contacting it
+
+        Capabilities may be plain action names or dictionaries carrying a
+        "name" plus optional "description" and JSON schema "parameters".
+        Metadata the tool reported itself through get_capabilities, such as
+        the input schema of an MCP tools/list, fills in what the configuration
+        leaves out, and actions only the tool reported are included as well.
+
+        Returns:
+            List[Dict[str, Any]]: Normalized action descriptions
+        """
+        configured: Dict[str, Dict[str, Any]] = {}
+        for capability in self.capabilities:
+            if isinstance(capability, str):
+                capability = {"name": capability}
+            if capability.get("name"):
+                configured[capability["name"]] = capability
+        live_actions = self._live_actions
+        names = list(configured) + [name for name in live_actions if name not in configured]
+
+        actions = []
+        for name in names:
+            configured_action = configured.get(name, {})
+            live_action = live_actions.get(name, {})
+            actions.append({
+                **live_action,
+                **configured_action,
+                "name": name,
+                "description": (configured_action.get("description") or live_action.get("description")
+                                or f"{name} action of {self.name}"),
+                "parameters": (configured_action.get("parameters") or live_action.get("parameters")
+                               or live_action.get("inputSchema") or {"type": "object", "properties": {}}),
+            })
+        return actions
+
+    def action_policy(self, action: str) -> Dict[str, Any]:
+        """
+        Get the caching policy of an action
+        
+        The policy comes from the capability metadata the tool reported or was
+        configured with ("cacheable", "ttl", "mutating" or the MCP "readOnlyHint"
+        annotation), overridden by the tool's "cache" config, e.g.
+        {"ttl": 30, "actions": {"search": {"cacheable": true, "ttl": 10}}}.
+        Actions not known to be cacheable are treated as mutating.
+        
+        Args:
+            action: Action name
+            
+        Returns:
+            Dict[str, Any]: "cacheable", "ttl" (None for the cache default) and "mutating"
+        """
+        metadata: Dict[str, Any] = {}
+        configured = next((c for c in self.capabilities if isinstance(c, dict) and c.get("name") == action), None)
+        for source in (configured, self._live_actions.get(action)):
+            if not source:
+                continue
+            annotations = source.get("annotations") or {}
+            if "readOnlyHint" in annotations:
+                metadata["cacheable"] = bool(annotations["readOnlyHint"])
+            metadata.update({key: source[key] for key in ("cacheable", "ttl", "mutating") if key in source})
+        
+        override = self.cache_config.get("actions", {}).get(action)
+        if isinstance(override, bool):
+            override = {"cacheable": override}
+        metadata.update(override or {})
+        
+        cacheable = bool(metadata.get("cacheable", False)) and self.cache_config.get("enabled", True)
+        return {
+            "cacheable": cacheable,
+            "ttl": metadata.get("ttl", self.cache_config.get("ttl")),
+            "mutating": bool(metadata.get("mutating", not cacheable)),
+        }
     
-    def execute_action(self, action: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    def execute_action(self, action: str, params: Dict[str, Any] = None, raw: bool = False) -> Any:
         """
         Execute an action on the MCP tool
         
         Args:
             action: Action name to execute
             params: Parameters for the action
+            raw: Return the JSON body of a successful HTTP response as bytes instead of parsing it
             
         Returns:
-            Dict[str, Any]: Response from the MCP tool
+            Dict[str, Any]: Response from the MCP tool, or its body as bytes if raw;
+            errors are always returned as a dictionary
         """
         if not params:
             params = {}
         
+        # Persistent transports send a single framed message and report their own connection errors
+        if self.transport is not None:
+            try:
+                return self.transport.call(action, params)
+            except (OSError, JSONRPCError, TimeoutError, CancelledError) as e:
+                error_msg = f"Error executing action {action} on {self.name}: {e}"
+                logger.error("Error executing action %s on %s: %s", action, self.name, e, extra=HOT_PATH)
+                return {"error": error_msg}
+        
         if not self.check_connection():
             return {"error": f"Tool {self.name} is not connected"}
         
@@ -91,20 +520,68 @@ class MCPClient:
             # MCP specification suggests tools expose action endpoints at /actions/{action}
             response = requests.post(
                 f"{self.url}/actions/{action}",
-                json=params
+                data=json_dumps(params),
+                headers={"Content-Type": "application/json"},
+                timeout=self.timeout
             )
             
             if response.status_code == 200:
-                logger.info(f"Successfully executed action {action} on {self.name}")
-                return response.json()
+                logger.debug("Successfully executed action %s on %s", action, self.name, extra=HOT_PATH)
+                return response.content if raw else json_loads(response.content)
             else:
                 error_msg = f"Failed to execute action {action} on {self.name}: {response.status_code}"
-                logger.error(error_msg)
+                logger.error("Failed to execute action %s on %s: %s", action, self.name, response.status_code,
+                             extra=HOT_PATH)
                 return {"error": error_msg, "details": response.text}
         except requests.exceptions.RequestException as e:
             error_msg = f"Error executing action {action} on {self.name}: {e}"
-            logger.error(error_msg)
+            logger.error("Error executing action %s on %s: %s", action, self.name, e, extra=HOT_PATH)
             return {"error": error_msg}
+        except ValueError as e:
+            error_msg = f"Invalid JSON returned by action {action} on {self.name}: {e}"
+            logger.error("Invalid JSON returned by action %s on %s: %s", action, self.name, e, extra=HOT_PATH)
+            return {"error": error_msg}
+    
+    def execute_action_stream(self, action: str, params: Dict[str, Any] = None,
+                              chunk_size: int = 64 * 1024) -> ActionStream:
+        """
+        Execute an action on the MCP tool without buffering its response
+        
+        Args:
+            action: Action name to execute
+            params: Parameters for the action
+            chunk_size: Size of the chunks read from the tool
+            
+        Returns:
+            ActionStream: Streamed response; callers must consume or close it
+            
+        Raises:
+            ValueError: If the tool does not use the HTTP transport or has no URL
+            requests.exceptions.RequestException: If the tool cannot be reached
+        """
+        if self.transport is not None:
+            raise ValueError(f"Streaming actions are only supported for HTTP tools, {self.name} uses JSON-RPC")
+        if not self.url:
+            raise ValueError(f"No URL defined for tool {self.name}")
+        
+        try:
+            # The timeout bounds the connection and each wait for the next chunk, not the whole transfer
+            response = requests.post(
+                f"{self.url}/actions/{action}",
+                data=json_dumps(params or {}),
+                headers={"Content-Type": "application/json"},
+                stream=True,
+                timeout=self.timeout
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error("Error executing action %s on %s: %s", action, self.name, e, extra=HOT_PATH)
+            raise
+        if response.status_code != 200:
+            logger.error("Failed to execute action %s on %s: %s", action, self.name, response.status_code,
+                         extra=HOT_PATH)
+        else:
+            logger.debug("Streaming action %s from %s", action, self.name, extra=HOT_PATH)
+        return ActionStream(response, chunk_size=chunk_size)
 
 
 class MCPHost:
@@ -121,23 +598,50 @@ class MCPHost:
         self.config_path = config_path
         self.config = self._load_config()
         self.tools: Dict[str, MCPClient] = {}
+        cache_config = self.config.get("cache", {})
+        self.cache = ToolResultCache(
+            max_entries=cache_config.get("max_entries", 1024),
+            max_bytes=cache_config.get("max_bytes", 32 * 1024 * 1024),
+            default_ttl=cache_config.get("default_ttl", 60.0)
+        )
+        self.limiters: Dict[str, AdaptiveLimiter] = {}
+        streaming_config = self.config.get("streaming", {})
+        self.chunk_size = streaming_config.get("chunk_size", 64 * 1024)
+        self.spool_threshold = streaming_config.get("spool_threshold", 8 * 1024 * 1024)
+        # Calls in flight per client, so replaced or removed clients can be drained before closing
+        self._in_flight: Dict[MCPClient, int] = {}
+        self._in_flight_changed = threading.Condition()
+        self._reload_lock = threading.Lock()
         self._initialize_tools()
     
-    def _load_config(self) -> Dict[str, Any]:
+    def _load_config(self, strict: bool = False) -> Dict[str, Any]:
         """
         Load configuration from file
         
+        Args:
+            strict: Raise instead of falling back to an empty configuration
+        
         Returns:
             Dict[str, Any]: Configuration dictionary
+        
+        Raises:
+            ValueError: If strict and the file is missing or cannot be parsed
         """
         if not os.path.exists(self.config_path):
+            if strict:
+                raise ValueError(f"Config file {self.config_path} not found")
             logger.warning(f"Config file {self.config_path} not found, using empty configuration")
             return {"tools": []}
         
         try:
             with open(self.config_path, "r") as f:
-                return json.load(f)
+                config = json.load(f)
+            if not isinstance(config, dict):
+                raise ValueError("Configuration must be a JSON object")
+            return config
         except Exception as e:
+            if strict:
+                raise ValueError(f"Error loading configuration: {e}")
             logger.error(f"Error loading configuration: {e}")
             return {"tools": []}
     
@@ -150,6 +654,122 @@ class MCPHost:
                     self.tools[tool_id] = MCPClient(tool_config)
                     logger.info(f"Initialized MCP client for {tool_config.get('name', tool_id)}")
     
+    @staticmethod
+    def _active_tool_configs(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        return {t["id"]: t for t in config.get("tools", []) if t.get("id") and t.get("active", True)}
+    
+    @contextmanager
+    def _track(self, client: MCPClient):
+        """Count a call in flight on a client for the duration of the block"""
+        with self._in_flight_changed:
+            self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        try:
+            yield
+        finally:
+            with self._in_flight_changed:
+                self._in_flight[client] -= 1
+                if not self._in_flight[client]:
+                    del self._in_flight[client]
+                    self._in_flight_changed.notify_all()
+    
+    def _drain(self, clients: List[MCPClient], timeout: float) -> List[MCPClient]:
+        """
+        Wait for the calls in flight on clients that no longer receive new calls, then close them
+        
+        Returns:
+            List[MCPClient]: Clients that still had calls in flight when the deadline passed
+        """
+        deadline = time.monotonic() + timeout
+        with self._in_flight_changed:
+            while any(client in self._in_flight for client in clients):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._in_flight_changed.wait(remaining)
+            busy = [client for client in clients if client in self._in_flight]
+        for client in clients:
+            if client in busy:
+                logger.warning(f"Closing {client.name} with calls still in flight after {timeout}s")
+            client.close()
+        return busy
+    
+    def reload(self, drain_timeout: float = 30.0) -> Dict[str, List[str]]:
+        """
+        Re-read the configuration and apply tool changes in place
+        
+        Clients of unchanged tools are kept with their connections, limiters and
+        cached results. Added tools get new clients. Removed and changed tools
+        stop receiving new calls immediately, and their old clients are closed
+        once their calls in flight finish or the drain timeout passes.
+        
+        Args:
+            drain_timeout: Maximum time to wait for calls in flight on retired clients
+            
+        Returns:
+            Dict[str, List[str]]: Tool IDs that were added, removed, updated or kept,
+            and those whose drain timed out
+        
+        Raises:
+            ValueError: If the configuration cannot be read; the running tools are left untouched
+        """
+        with self._reload_lock:
+            config = self._load_config(strict=True)
+            old_configs = self._active_tool_configs(self.config)
+            new_configs = self._active_tool_configs(config)
+            concurrency_changed = config.get("concurrency") != self.config.get("concurrency")
+            
+            tools = {}
+            changes = {"added": [], "removed": [], "updated": [], "unchanged": [], "drain_timed_out": []}
+            for tool_id, tool_config in new_configs.items():
+                if tool_id in self.tools and old_configs.get(tool_id) == tool_config:
+                    tools[tool_id] = self.tools[tool_id]
+                    changes["unchanged"].append(tool_id)
+                else:
+                    tools[tool_id] = MCPClient(tool_config)
+                    changes["updated" if tool_id in self.tools else "added"].append(tool_id)
+            changes["removed"] = [tool_id for tool_id in self.tools if tool_id not in new_configs]
+            retired = {tool_id: self.tools[tool_id] for tool_id in changes["removed"] + changes["updated"]}
+            
+            # Swap the whole mapping so concurrent lookups see either the old or the new tools
+            self.config = config
+            self.tools = tools
+            streaming_config = config.get("streaming", {})
+            self.chunk_size = streaming_config.get("chunk_size", self.chunk_size)
+            self.spool_threshold = streaming_config.get("spool_threshold", self.spool_threshold)
+            for tool_id in (list(self.limiters) if concurrency_changed else retired):
+                self.limiters.pop(tool_id, None)
+            for tool_id in retired:
+                self.cache.invalidate_tool(tool_id)
+            
+            busy = self._drain(list(retired.values()), drain_timeout)
+            changes["drain_timed_out"] = [tool_id for tool_id, client in retired.items() if client in busy]
+            logger.info(f"Reloaded MCP tools: {changes}")
+            return changes
+    
+    def shutdown(self, timeout: float = 30.0) -> bool:
+        """
+        Stop routing calls to tools, wait for calls in flight and close every client
+        
+        Args:
+            timeout: Maximum time to wait for calls in flight
+            
+        Returns:
+            bool: True if every call finished before the deadline
+        """
+        with self._reload_lock:
+            clients = list(self.tools.values())
+            self.tools = {}
+            return not self._drain(clients, timeout)
+    
+    def _limiter(self, tool_id: str) -> AdaptiveLimiter:
+        """Get the concurrency limiter of a tool, configured from the host and tool "concurrency" settings"""
+        limiter = self.limiters.get(tool_id)
+        if limiter is None:
+            tool_config = next((t for t in self.config.get("tools", []) if t.get("id") == tool_id), {})
+            settings = {**self.config.get("concurrency", {}), **tool_config.get("concurrency", {})}
+            limiter = self.limiters.setdefault(tool_id, AdaptiveLimiter(**settings))
+        return limiter
+    
     def get_tool(self, tool_id: str) -> Optional[MCPClient]:
         """
         Get an MCP client by tool ID
@@ -198,17 +818,19 @@ class MCPHost:
             return False
         
         # Initialize MCP client for the tool
-        self.tools[tool_id] = MCPClient(tool_config)
+        self.tools = {**self.tools, tool_id: MCPClient(tool_config)}
         logger.info(f"Added MCP tool {tool_config.get('name', tool_id)}")
         
         return True
     
-    def remove_tool(self, tool_id: str) -> bool:
+    def remove_tool(self, tool_id: str, drain_timeout: Optional[float] = None) -> bool:
         """
         Remove an MCP tool from the configuration
         
         Args:
             tool_id: Tool ID to remove
+            drain_timeout: Maximum time to wait for the tool's calls in flight,
+                defaults to the configured lifecycle drain_timeout
             
         Returns:
             bool: True if successful, False otherwise
@@ -228,8 +850,14 @@ class MCPHost:
             logger.error(f"Error saving configuration: {e}")
             return False
         
-        # Remove MCP client
-        del self.tools[tool_id]
+        # Remove MCP client and its cached results, closing it once its calls in flight finish
+        client = self.tools[tool_id]
+        self.tools = {k: v for k, v in self.tools.items() if k != tool_id}
+        self.limiters.pop(tool_id, None)
+        self.cache.invalidate_tool(tool_id)
+        if drain_timeout is None:
+            drain_timeout = self.config.get("lifecycle", {}).get("drain_timeout", 30.0)
+        self._drain([client], timeout=drain_timeout)
         logger.info(f"Removed MCP tool {tool_id}")
         
         return True
@@ -271,10 +899,149 @@ class MCPHost:
         Returns:
             Dict[str, Any]: Response from the MCP tool
         """
+        return self._execute(tool_id, action, params, raw=False)
+    
+    def execute_action_json(self, tool_id: str, action: str, params: Dict[str, Any] = None) -> bytes:
+        """
+        Execute an action on an MCP tool and return its result as JSON bytes
+        
+        Uncached results of HTTP tools are passed through as the tool sent them,
+        without being parsed and serialized again.
+        
+        Args:
+            tool_id: Tool ID to execute action on
+            action: Action name to execute
+            params: Parameters for the action
+            
+        Returns:
+            bytes: JSON-encoded response from the MCP tool
+        """
+        result = self._execute(tool_id, action, params, raw=True)
+        return result if isinstance(result, bytes) else json_dumps(result)
+    
+    def _execute(self, tool_id: str, action: str, params: Optional[Dict[str, Any]], raw: bool) -> Any:
         client = self.get_tool(tool_id)
         if not client:
             error_msg = f"Tool {tool_id} not found"
             logger.error(error_msg)
             return {"error": error_msg}
         
-        return client.execute_action(action, params)
\ No newline at end of file
+        policy = client.action_policy(action)
+        if policy["cacheable"]:
+            cached = self.cache.get(tool_id, action, params)
+            if cached is not None:
+                return cached
+        
+        # Calls waiting for the limiter already count as in flight, so a reload does not close the client under them
+        with self._track(client):
+            limiter = self._limiter(tool_id)
+            if not limiter.acquire():
+                error_msg = f"Tool {tool_id} is at its concurrency limit, call timed out in the queue"
+                logger.warning("Tool %s is at its concurrency limit, call timed out in the queue", tool_id,
+                               extra=HOT_PATH)
+                return {"error": error_msg}
+            
+            started = time.monotonic()
+            failed = True
+            try:
+                # Cached results are kept parsed, so only uncached calls can pass the body through
+                result = client.execute_action(action, params, raw=raw and not policy["cacheable"])
+                # Actions may return any JSON value; only error dictionaries count as failures
+                failed = isinstance(result, dict) and "error" in result
+            finally:
+                limiter.release(time.monotonic() - started, error=failed, action=action)
+        
+        if policy["cacheable"]:
+            # A cached null would read as a miss, so it is not stored
+            if not failed and result is not None:
+                self.cache.put(tool_id, action, params, result, ttl=policy["ttl"])
+        elif policy["mutating"]:
+            self.cache.invalidate_tool(tool_id)
+        
+        return result
+    
+    def execute_action_stream(self, tool_id: str, action: str, params: Dict[str, Any] = None) -> ActionStream:
+        """
+        Execute an action on an MCP tool and stream its response
+        
+        Streamed results bypass the result cache, so peak memory stays bounded
+        by the chunk size no matter how large the result is.
+        
+        Args:
+            tool_id: Tool ID to execute action on
+            action: Action name to execute
+            params: Parameters for the action
+            
+        Returns:
+            ActionStream: Streamed response from the MCP tool
+            
+        Raises:
+            KeyError: If the tool is not registered
+            ValueError: If the tool does not use the HTTP transport
+            requests.exceptions.RequestException: If the tool cannot be reached
+            TimeoutError: If the call timed out waiting for the tool's concurrency limit
+        """
+        client = self.get_tool(tool_id)
+        if not client:
+            raise KeyError(f"Tool {tool_id} not found")
+        
+        # The slot is held until the stream is closed; latency is measured up to the response headers
+        limiter = self._limiter(tool_id)
+        if not limiter.acquire():
+            logger.warning("Tool %s is at its concurrency limit, call timed out in the queue", tool_id, extra=HOT_PATH)
+            raise TimeoutError(f"Tool {tool_id} is at its concurrency limit, call timed out in the queue")
+        started = time.monotonic()
+        try:
+            stream = client.execute_action_stream(action, params, chunk_size=self.chunk_size)
+        except Exception:
+            limiter.release(time.monotonic() - started, error=True, action=action)
+            raise
+        latency = time.monotonic() - started
+        stream.on_close = lambda: limiter.release(latency, error=stream.status_code >= 500, action=action)
+        
+        policy = client.action_policy(action)
+        if not policy["cacheable"] and policy["mutating"]:
+            self.cache.invalidate_tool(tool_id)
+        return stream
+    
+    def execute_action_file(self, tool_id: str, action: str, params: Dict[str, Any] = None) -> IO[bytes]:
+        """
+        Execute an action on an MCP tool and return its raw response as a file-like object
+        
+        Results larger than the configured spool threshold are written to a
+        temporary file instead of being held in memory.
+        
+        Args:
+            tool_id: Tool ID to execute action on
+            action: Action name to execute
+            params: Parameters for the action
+            
+        Returns:
+            IO[bytes]: File-like object positioned at the start of the response body
+            
+        Raises:
+            KeyError: If the tool is not registered
+            ValueError: If the tool does not use the HTTP transport
+            requests.exceptions.RequestException: If the tool cannot be reached
+            TimeoutError: If the call timed out waiting for the tool's concurrency limit
+            RuntimeError: If the tool answered with an error status
+        """
+        return self.execute_action_stream(tool_id, action, params).to_file(self.spool_threshold)
+    
+    def get_limiter_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the current concurrency limit and queue length of every tool
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Limiter statistics per tool ID
+        """
+        return {tool_id: self._limiter(tool_id).get_stats() for tool_id in self.tools}
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get tool result cache statistics
+        
+        Returns:
+            Dict[str, Any]: Cache size and hit/miss counters per tool
+        """
+        return self.cache.get_stats()
\ No newline at end of file
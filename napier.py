@@ -0,0 +1,128 @@
+import argparse
+import http.client
+import json
+import os
+import socket
+import sys
+
+CONFIG_PATH = "config/napier_config.json"
+DEFAULT_SOCKET = "~/.napier/napier.sock"
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a Unix domain socket
+    """
+    def __init__(self, socket_path: str, timeout: float = 600):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def load_config():
+    try:
+        with open(CONFIG_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def request(config, method, path, body=None):
+    """Send a request to the daemon and return the decoded JSON response"""
+    socket_path = os.path.expanduser(config.get("daemon", {}).get("socket", DEFAULT_SOCKET))
+    connection = UnixHTTPConnection(socket_path)
+    try:
+        payload = json.dumps(body) if body is not None else None
+        connection.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        data = json.loads(response.read() or b"{}")
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit(f"NAPIER daemon is not running (no socket at {socket_path}). Start it with 'napier daemon'.")
+    finally:
+        connection.close()
+    if response.status >= 400:
+        sys.exit(f"Error {response.status}: {data.get('detail', data)}")
+    return data
+
+
+def chat(config, args):
+    prompt = args.prompt if args.prompt != "-" else sys.stdin.read()
+    body = {"model": args.model or config.get("default_model", "llama3"), "stream": False, "agent": args.agent}
+    if args.session:
+        body.update({"session_id": args.session, "message": prompt})
+    else:
+        body["messages"] = [{"role": "user", "content": prompt}]
+    result = request(config, "POST", "/chat", body)
+    print(result.get("message", {}).get("content", ""))
+
+
+def tools_status(config, args):
+    status = request(config, "GET", "/status")
+    print(f"ollama\t{'running' if status['ollama'] else 'stopped'}")
+    for tool_id, running in status["tools"].items():
+        print(f"{tool_id}\t{'running' if running else 'stopped'}")
+
+
+def tools_lifecycle(config, args):
+    job = request(config, "POST", f"/tools/{args.tool_id}/{args.tools_command}")
+    print(job["job_id"])
+
+
+def models_list(config, args):
+    for model in request(config, "GET", "/models")["models"]:
+        print(model)
+
+
+def models_pull(config, args):
+    result = request(config, "POST", "/models/pull", {"name": args.name})
+    print(result.get("status", "success"))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="napier", description="Local LLM agent with MCP capabilities")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("daemon", help="Run the NAPIER daemon")
+
+    chat_parser = commands.add_parser("chat", help="Send a prompt to the daemon")
+    chat_parser.add_argument("-p", "--prompt", required=True, help="Prompt, or '-' to read it from stdin")
+    chat_parser.add_argument("-m", "--model", help="Model to use, defaults to the configured default model")
+    chat_parser.add_argument("-s", "--session", help="Session ID to continue")
+    chat_parser.add_argument("--agent", action="store_true", help="Let the model call MCP tools")
+    chat_parser.set_defaults(handler=chat)
+
+    tools_parser = commands.add_parser("tools", help="Manage MCP tools")
+    tools_commands = tools_parser.add_subparsers(dest="tools_command", required=True)
+    tools_commands.add_parser("status", help="Show Ollama and tool status").set_defaults(handler=tools_status)
+    for action in ("install", "start", "stop", "restart"):
+        action_parser = tools_commands.add_parser(action, help=f"{action.capitalize()} a tool in the background")
+        action_parser.add_argument("tool_id")
+        action_parser.set_defaults(handler=tools_lifecycle)
+
+    models_parser = commands.add_parser("models", help="Manage Ollama models")
+    models_commands = models_parser.add_subparsers(dest="models_command", required=True)
+    models_commands.add_parser("list", help="List available models").set_defaults(handler=models_list)
+    pull_parser = models_commands.add_parser("pull", help="Pull a model")
+    pull_parser.add_argument("name")
+    pull_parser.set_defaults(handler=models_pull)
+    return parser
+
+
+# `napier daemon` runs the host; every other subcommand is a thin standard-library
+# client talking to it over the Unix domain socket, so scripted calls skip the boot path
+def main():
+    args = build_parser().parse_args()
+    if args.command == "daemon":
+        # Only the daemon pays for importing the host and its dependencies
+        import napier_cli
+        napier_cli.run_daemon()
+        return
+    args.handler(load_config(), args)
+
+
+if __name__ == "__main__":
+    main()
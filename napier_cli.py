@@ -1,9 +1,13 @@
 import subprocess
+import asyncio
 import requests
+import httpx
 import json
+import hashlib
 import sys
 import os
 import signal
+import socket
 import time
 from time import sleep
 from rich.console import Console
@@ -11,21 +15,18 @@ import shutil
 from pathlib import Path
 import threading
 import logging
-from rich.logging import RichHandler
+from concurrent.futures import ThreadPoolExecutor
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 import platform
 
-# Initialize logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True)]
-)
+# Logging is set up by main() or run_daemon() through setup_logging
 logger = logging.getLogger("napier")
 
 # Initialize console for rich output
@@ -47,7 +48,12 @@ app = FastAPI(title="NAPIER MCP Host", description="Local LLM agent with MCP cap
 
 # Global variables for MCP tools
 mcp_tools = []
+tool_processes = {}
 ollama_process = None
+# Running API servers and their threads, stopped by graceful_shutdown
+api_servers = []
+api_threads = []
+api_servers_stop = threading.Event()
 CONFIG_PATH = "config/napier_config.json"
 DEFAULT_CONFIG = {
     "name": "napier-cli",
@@ -56,12 +62,87 @@ DEFAULT_CONFIG = {
     "version": "0.1.0",
     "mcp_host": {
         "host": "0.0.0.0",
-        "port": 8000
+        "port": 8000,
+        "http2": False,
+        "certfile": None,
+        "keyfile": None
     },
     "ollama": {
         "url": "http://localhost:11434",
         "api_version": "v1"
     },
+    "agent": {
+        "max_steps": 5,
+        "max_seconds": 120,
+        "max_parallel_tools": 4
+    },
+    "cache": {
+        "max_entries": 1024,
+        "max_bytes": 33554432,
+        "default_ttl": 60
+    },
+    "streaming": {
+        "chunk_size": 65536,
+        "spool_threshold": 8388608
+    },
+    "sessions": {
+        "path": "data/sessions.db",
+        "context_messages": 200,
+        "compact_interval": 3600,
+        "compact_after_days": 30,
+        "keep_messages": 50
+    },
+    "batch": {
+        "concurrency": 4,
+        "model_concurrency": {},
+        "backends": ["http://localhost:11434"],
+        "max_retries": 2,
+        "timeout": 600,
+        "directory": "data/batches"
+    },
+    "daemon": {
+        "socket": "~/.napier/napier.sock"
+    },
+    "embeddings": {
+        "model": "nomic-embed-text",
+        "max_batch_size": 32,
+        "max_wait_ms": 10,
+        "cache_size": 10000,
+        "timeout": 60,
+        "index_directory": "data/indexes"
+    },
+    "concurrency": {
+        "initial_limit": 4,
+        "min_limit": 1,
+        "max_limit": 32,
+        "queue_timeout": 30
+    },
+    "compression": {
+        "enabled": True,
+        "minimum_size": 1024,
+        "max_request_size": 67108864,
+        "encodings": ["zstd", "br", "gzip"]
+    },
+    "lifecycle": {
+        "drain_timeout": 30,
+        "shutdown_timeout": 30
+    },
+    "websocket": {
+        "credit_timeout": 60,
+        "agent_workers": 8
+    },
+    "terminal": {
+        "refresh_per_second": 8,
+        "page_size": 50,
+        "probe_workers": 8
+    },
+    "logging": {
+        "level": "INFO",
+        "file": "logs/napier.jsonl",
+        "hot_path_rate": 10,
+        "hot_path_burst": 20,
+        "hot_path_sample_rate": 1.0
+    },
     "tools": []  # Empty by default, tools will be added through the interface
 }
 
@@ -132,18 +213,19 @@ def start_ollama():
             console.print("[green]Ollama is already running.[/green]")
             return True
         
-        # Start Ollama based on platform
+        # Start Ollama based on platform; its output is discarded, since a pipe nobody
+        # reads fills up and blocks a long-running Ollama on its next log line
         if platform.system() == "Windows":
             # On Windows, we start Ollama differently
             ollama_process = subprocess.Popen(["ollama", "serve"], 
-                                             stdout=subprocess.PIPE, 
-                                             stderr=subprocess.PIPE,
+                                             stdout=subprocess.DEVNULL, 
+                                             stderr=subprocess.DEVNULL,
                                              creationflags=subprocess.CREATE_NO_WINDOW)
         else:
             # On Unix-like systems
             ollama_process = subprocess.Popen(["ollama", "serve"], 
-                                             stdout=subprocess.PIPE, 
-                                             stderr=subprocess.PIPE)
+                                             stdout=subprocess.DEVNULL, 
+                                             stderr=subprocess.DEVNULL)
         
         # Wait for Ollama to start
         for _ in range(5):
@@ -163,12 +245,12 @@ def start_ollama():
 # Function to check if Ollama is running
 def is_ollama_running():
     try:
-        response = requests.get("http://localhost:11434/api/tags")
+        response = requests.get("http://localhost:11434/api/tags", timeout=5)
         return response.status_code == 200
     except requests.exceptions.RequestException:
         return False
 
-# Function to stop Ollama
+# Function to stop Ollama if NAPIER started it; an Ollama that was already running keeps its loaded models
 def stop_ollama():
     global ollama_process
     
@@ -187,18 +269,9 @@ def stop_ollama():
             console.print("[bold green]Ollama has been stopped.[/bold green]")
         except Exception as e:
             console.print(f"[bold red]Error stopping Ollama: {e}[/bold red]")
-    else:
-        try:
-            # Attempt to kill any running Ollama process
-            if platform.system() == "Windows":
-                subprocess.run(["taskkill", "/F", "/IM", "ollama.exe"], 
-                               stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-            else:
-                subprocess.run("pkill -f ollama", shell=True, 
-                               stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-            console.print("[bold green]Ollama has been stopped.[/bold green]")
-        except Exception:
-            console.print("[yellow]Ollama was not running.[/yellow]")
+        ollama_process = None
+    elif is_ollama_running():
+        console.print("[yellow]Leaving the Ollama server that was already running untouched.[/yellow]")
 
 # Function to load configuration
 def load_config():
@@ -235,9 +308,29 @@ def save_config(config):
 
 # Import MCP implementation
 from mcp import MCPHost
+from napier_logging import setup_logging
+from agent import Agent
+from sessions import SessionStore
+from batch import BatchManager
+from jobs import JobManager
+from embeddings import EmbeddingBatcher, VectorIndex
+from chat_streams import ChatStream, StreamCancelled, StreamStalled, generate_chat
+from rendering import MarkdownStream, show_tools_table
+from compression import CompressionMiddleware
+from lifecycle import RequestDrainer
+
+# Counts requests in flight across every listener so shutdown can drain them
+request_drainer = RequestDrainer(app)
 
-# Global variable for MCP Host
+# Global variables for MCP Host, the tool-calling agent and the chat session store
 mcp_host = None
+agent = None
+session_store = None
+batch_manager = None
+job_manager = None
+embedding_batcher = None
+vector_indexes = {}
+websocket_agent_executor = None
 
 # Initialize MCP Host
 def initialize_mcp_host():
@@ -246,6 +339,87 @@ def initialize_mcp_host():
     console.print("[green]Initialized MCP Host.[/green]")
     return mcp_host
 
+# Get the agent that connects the model to the MCP Host tools
+def get_agent():
+    global agent, mcp_host
+    
+    if mcp_host is None:
+        mcp_host = initialize_mcp_host()
+    
+    if agent is None or agent.mcp_host is not mcp_host:
+        config = load_config()
+        agent_config = config.get("agent", DEFAULT_CONFIG["agent"])
+        agent = Agent(
+            mcp_host,
+            ollama_url=config.get("ollama", {}).get("url", "http://localhost:11434"),
+            max_steps=agent_config.get("max_steps", 5),
+            max_seconds=agent_config.get("max_seconds", 120),
+            max_parallel_tools=agent_config.get("max_parallel_tools", 4)
+        )
+    return agent
+
+# Get the persistent chat session store, compacting old sessions in the background
+def get_session_store():
+    global session_store
+    
+    if session_store is None:
+        sessions_config = load_config().get("sessions", DEFAULT_CONFIG["sessions"])
+        session_store = SessionStore(
+            sessions_config.get("path", "data/sessions.db"),
+            context_messages=sessions_config.get("context_messages", 200)
+        )
+        session_store.start_compaction(
+            interval=sessions_config.get("compact_interval", 3600),
+            older_than_days=sessions_config.get("compact_after_days", 30),
+            keep_messages=sessions_config.get("keep_messages", 50)
+        )
+    return session_store
+
+# Get the manager of offline batch jobs
+def get_batch_manager():
+    global batch_manager
+    
+    if batch_manager is None:
+        config = load_config()
+        batch_manager = BatchManager(
+            config.get("batch", DEFAULT_CONFIG["batch"]),
+            default_model=config.get("default_model", "llama3"),
+            ollama_url=config.get("ollama", {}).get("url", "http://localhost:11434")
+        )
+    return batch_manager
+
+# Get the micro-batcher for embedding requests
+def get_embedding_batcher():
+    global embedding_batcher
+    
+    if embedding_batcher is None:
+        config = load_config()
+        embeddings_config = config.get("embeddings", DEFAULT_CONFIG["embeddings"])
+        embedding_batcher = EmbeddingBatcher(
+            ollama_url=config.get("ollama", {}).get("url", "http://localhost:11434"),
+            max_batch_size=embeddings_config.get("max_batch_size", 32),
+            max_wait_ms=embeddings_config.get("max_wait_ms", 10),
+            cache_size=embeddings_config.get("cache_size", 10000),
+            timeout=embeddings_config.get("timeout", 60)
+        )
+    return embedding_batcher
+
+# Get the thread pool running agent turns of WebSocket chat streams
+def get_websocket_agent_executor():
+    global websocket_agent_executor
+    
+    if websocket_agent_executor is None:
+        workers = load_config().get("websocket", DEFAULT_CONFIG["websocket"]).get("agent_workers", 8)
+        websocket_agent_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="napier-ws-agent")
+    return websocket_agent_executor
+
+# Get a local vector index by name, opening it on first use
+def get_vector_index(name):
+    if name not in vector_indexes:
+        embeddings_config = load_config().get("embeddings", DEFAULT_CONFIG["embeddings"])
+        vector_indexes[name] = VectorIndex(embeddings_config.get("index_directory", "data/indexes"), name)
+    return vector_indexes[name]
+
 # Check if necessary MCP tools are installed and running
 def ensure_mcp_tools():
     global mcp_tools, mcp_host
@@ -262,14 +436,23 @@ def ensure_mcp_tools():
     # Check connections to all tools
     connection_status = mcp_host.check_all_connections()
     
-    # Start tools that are not running
+    # Start tools that are not running, installing and starting different tools in parallel
+    jobs = []
     for tool in active_tools:
         tool_id = tool.get("id")
         if tool_id in connection_status and not connection_status[tool_id]:
             console.print(f"[yellow]Tool {tool['name']} is not running. Starting it now...[/yellow]")
-            start_mcp_tool(tool)
+            jobs.append((tool, submit_tool_job("start", tool)))
         else:
             console.print(f"[green]{tool['name']} is already running.[/green]")
+    
+    for tool, job in jobs:
+        seen = 0
+        while not job.done or seen < len(job.events):
+            events = job.wait_for_events(seen, timeout=1)
+            seen += len(events)
+            for event in events:
+                console.print(Text(f"{tool['name']}: {event['message']}"))
 
 # Function to check if a specific tool is running
 def is_tool_running(tool):
@@ -296,33 +479,46 @@ def is_tool_running(tool):
     except requests.exceptions.RequestException:
         return False
 
+# Function to install a specific MCP tool if it has not been installed yet
+def install_mcp_tool(tool, report=None):
+    report = report or console.print
+    
+    command_dir = tool.get("command_directory", "./")
+    if not tool.get("installation_command") or os.path.exists(os.path.join(command_dir, "node_modules")):
+        return True
+    
+    report(f"[yellow]Installing {tool['name']}...[/yellow]")
+    try:
+        install_dir = tool.get("installation_directory", command_dir)
+        process = subprocess.run(
+            tool["installation_command"], 
+            shell=True, 
+            cwd=install_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        if process.returncode != 0:
+            report(f"[bold red]Error installing {tool['name']}: {process.stderr.decode()}[/bold red]")
+            return False
+        report(f"[green]{tool['name']} installed successfully.[/green]")
+        return True
+    except Exception as e:
+        report(f"[bold red]Error installing {tool['name']}: {e}[/bold red]")
+        return False
+
 # Function to start a specific MCP tool
-def start_mcp_tool(tool):
+def start_mcp_tool(tool, report=None):
+    report = report or console.print
+    
     # Check if the tool directory exists
     command_dir = tool.get("command_directory", "./")
     if not os.path.exists(command_dir):
-        console.print(f"[bold red]Error: Directory {command_dir} does not exist.[/bold red]")
+        report(f"[bold red]Error: Directory {command_dir} does not exist.[/bold red]")
         return False
     
     # Check if we need to install the tool first
-    if tool.get("installation_command") and not os.path.exists(os.path.join(command_dir, "node_modules")):
-        console.print(f"[yellow]Installing {tool['name']}...[/yellow]")
-        try:
-            install_dir = tool.get("installation_directory", command_dir)
-            process = subprocess.run(
-                tool["installation_command"], 
-                shell=True, 
-                cwd=install_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            if process.returncode != 0:
-                console.print(f"[bold red]Error installing {tool['name']}: {process.stderr.decode()}[/bold red]")
-                return False
-            console.print(f"[green]{tool['name']} installed successfully.[/green]")
-        except Exception as e:
-            console.print(f"[bold red]Error installing {tool['name']}: {e}[/bold red]")
-            return False
+    if not install_mcp_tool(tool, report):
+        return False
     
     # Start the tool
     try:
@@ -332,29 +528,113 @@ def start_mcp_tool(tool):
         else:
             command = tool["start_command"].split()
         
+        # Stdio tools speak JSON-RPC over the process pipes, so their transport owns the process
+        client = mcp_host.get_tool(tool.get("id")) if mcp_host else None
+        stdio = tool.get("transport") == "stdio" and client is not None and client.transport is not None
+        
         # Start the process
-        console.print(f"[yellow]Starting {tool['name']}...[/yellow]")
-        process = subprocess.Popen(
-            command,
-            cwd=command_dir,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
+        report(f"[yellow]Starting {tool['name']}...[/yellow]")
+        if stdio:
+            process = client.transport.start()
+        else:
+            process = subprocess.Popen(
+                command,
+                cwd=command_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
         
         # Wait a moment to see if the process starts successfully
         time.sleep(2)
         
         # Check if the process is still running
         if process.poll() is None:
-            console.print(f"[green]{tool['name']} started successfully.[/green]")
+            tool_processes[tool.get("id")] = process
+            report(f"[green]{tool['name']} started successfully.[/green]")
             return True
         else:
-            console.print(f"[bold red]Error starting {tool['name']}: {process.stderr.read().decode()}[/bold red]")
+            report(f"[bold red]Error starting {tool['name']}: {process.stderr.read().decode()}[/bold red]")
             return False
     except Exception as e:
-        console.print(f"[bold red]Error starting {tool['name']}: {e}[/bold red]")
+        report(f"[bold red]Error starting {tool['name']}: {e}[/bold red]")
         return False
 
+# Function to stop a specific MCP tool started by NAPIER
+def stop_mcp_tool(tool, report=None):
+    report = report or console.print
+    
+    process = tool_processes.pop(tool.get("id"), None)
+    client = mcp_host.get_tool(tool.get("id")) if mcp_host else None
+    if process is None and client is not None:
+        # Stdio tools may have been spawned by their transport on first use
+        process = getattr(client.transport, "process", None)
+    if process is None or process.poll() is not None:
+        report(f"[yellow]{tool['name']} was not started by NAPIER.[/yellow]")
+        return process is not None
+    
+    report(f"[yellow]Stopping {tool['name']}...[/yellow]")
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    report(f"[green]{tool['name']} stopped.[/green]")
+    return True
+
+# Function to run a tool lifecycle action as a background job
+def submit_tool_job(kind, tool):
+    global job_manager
+    
+    if job_manager is None:
+        job_manager = JobManager()
+    
+    def run(job):
+        report = lambda message: job.report(Text.from_markup(message).plain)
+        if kind == "install":
+            return install_mcp_tool(tool, report)
+        if kind == "stop":
+            return stop_mcp_tool(tool, report)
+        if kind == "restart":
+            stop_mcp_tool(tool, report)
+            return start_mcp_tool(tool, report)
+        if is_tool_running(tool):
+            report(f"Tool {tool['name']} is already running")
+            return True
+        return start_mcp_tool(tool, report)
+    
+    return job_manager.submit(kind, tool["id"], run)
+
+# Apply configuration changes to the running MCP Host without restarting it;
+# raises ValueError, leaving the running tools untouched, if the config cannot be read
+def reload_mcp_tools():
+    global mcp_host
+    
+    if mcp_host is None:
+        mcp_host = initialize_mcp_host()
+    
+    previous_tools = {tool.get("id"): tool for tool in mcp_host.config.get("tools", [])}
+    config = load_config()
+    drain_timeout = config.get("lifecycle", DEFAULT_CONFIG["lifecycle"]).get("drain_timeout", 30)
+    changes = mcp_host.reload(drain_timeout=drain_timeout)
+    
+    # Processes follow their clients: stop removed tools, (re)start added and changed ones
+    tools = {tool.get("id"): tool for tool in mcp_tools}
+    changes["jobs"] = {}
+    for tool_id in changes["removed"]:
+        if tool_id in tool_processes:
+            changes["jobs"][tool_id] = submit_tool_job("stop", previous_tools.get(tool_id, {"id": tool_id, "name": tool_id})).id
+    for tool_id in changes["added"] + changes["updated"]:
+        kind = "restart" if tool_id in tool_processes else "start"
+        changes["jobs"][tool_id] = submit_tool_job(kind, tools[tool_id]).id
+    return changes
+
+# Reload the configuration on SIGHUP, keeping the running tools if it is broken
+def reload_on_signal():
+    try:
+        reload_mcp_tools()
+    except ValueError as e:
+        logger.error(f"Configuration reload aborted: {e}")
+
 # Function to display the current MCP tool configuration
 def display_config():
     config = load_config()
@@ -369,24 +649,17 @@ def display_config():
     
     console.print(table)
     
-    # Display tools
+    # Display tools right away; status cells fill in as the probes finish
     if mcp_tools:
-        tools_table = Table(title="MCP Tools", show_header=True, header_style="bold magenta")
-        tools_table.add_column("ID", style="dim")
-        tools_table.add_column("Name")
-        tools_table.add_column("URL")
-        tools_table.add_column("Status")
-        
-        for tool in mcp_tools:
-            status = "[green]Running[/green]" if is_tool_running(tool) else "[red]Stopped[/red]"
-            tools_table.add_row(
-                tool["id"],
-                tool["name"],
-                tool.get("url", "N/A"),
-                status
-            )
-        
-        console.print(tools_table)
+        terminal_config = config.get("terminal", DEFAULT_CONFIG["terminal"])
+        show_tools_table(
+            console,
+            mcp_tools,
+            is_tool_running,
+            page_size=terminal_config.get("page_size", 50),
+            max_workers=terminal_config.get("probe_workers", 8),
+            refresh_per_second=terminal_config.get("refresh_per_second", 8)
+        )
     else:
         console.print("[yellow]No MCP tools configured.[/yellow]")
 
@@ -423,10 +696,13 @@ def add_mcp_tool():
     config["tools"].append(new_tool)
     save_config(config)
     
-    # Reload config to update mcp_tools
-    load_config()
-    
     console.print(f"[bold green]Tool {tool_name} added successfully.[/bold green]")
+    
+    # Apply the change to the running MCP Host and start the tool in the background
+    try:
+        reload_mcp_tools()
+    except ValueError as e:
+        console.print(f"[bold red]Error applying configuration: {e}[/bold red]")
 
 # Remove an MCP tool from the configuration
 def remove_mcp_tool():
@@ -450,8 +726,11 @@ def remove_mcp_tool():
             save_config(config)
             console.print(f"[bold green]Tool {tool['name']} removed successfully.[/bold green]")
             
-            # Reload config to update mcp_tools
-            load_config()
+            # Apply the change to the running MCP Host, draining calls to the removed tool
+            try:
+                reload_mcp_tools()
+            except ValueError as e:
+                console.print(f"[bold red]Error applying configuration: {e}[/bold red]")
         else:
             console.print("[bold red]Invalid choice.[/bold red]")
     except ValueError:
@@ -464,10 +743,20 @@ def chat_with_ollama():
     
     ensure_model_available(model)  # <-- NEW LINE HERE
 
-    console.print(f"[bold green]Starting chat with {model}...[/bold green]")
-    console.print("[yellow]Type 'exit' to quit, 'change model' to switch models.[/yellow]")
+    # Resume a stored session or start a new one
+    store = get_session_store()
+    session_id = input("Session ID to resume (leave empty for a new session): ").strip()
+    if session_id and store.get_session(session_id):
+        conversation_history = store.load_context(session_id)
+        console.print(f"[green]Resumed session {session_id} ({len(conversation_history)} messages).[/green]")
+    else:
+        if session_id:
+            console.print(f"[yellow]Session {session_id} not found, starting a new one.[/yellow]")
+        session_id = store.create_session(model)
+        conversation_history = []
     
-    conversation_history = []
+    console.print(f"[bold green]Starting chat with {model}...[/bold green]")
+    console.print(f"[yellow]Session {session_id}. Type 'exit' to quit, 'change model' to switch models.[/yellow]")
 
     
     while True:
@@ -508,26 +797,39 @@ def chat_with_ollama():
         # Add prompt to conversation history
         conversation_history.append({"role": "user", "content": prompt})
         
-        # Send the request to Ollama
+        # Run the agent turn, letting the model call MCP tools, and render the answer as it streams
         try:
-            with console.status("[bold green]Thinking...[/bold green]"):
-                response = requests.post(
-                    "http://localhost:11434/api/chat",
-                    json={
-                        "model": model,
-                        "messages": conversation_history
-                    }
-                )
+            refresh_rate = config.get("terminal", DEFAULT_CONFIG["terminal"]).get("refresh_per_second", 8)
+            with MarkdownStream(console, refresh_per_second=refresh_rate,
+                                header=Text("\nAssistant:", style="bold blue")) as stream:
+                # Text streamed since the last tool call, i.e. by the model step that produced the answer
+                streamed = []
                 
-                if response.status_code == 200:
-                    assistant_response = response.json()["message"]["content"]
-                    console.print(f"\n[bold blue]Assistant:[/bold blue] {assistant_response}")
-                    
-                    # Add response to conversation history
-                    conversation_history.append({"role": "assistant", "content": assistant_response})
-                else:
-                    console.print(f"[bold red]Error: {response.status_code} - {response.text}[/bold red]")
-        except requests.exceptions.RequestException as e:
+                def on_event(event):
+                    if event["type"] == "delta":
+                        streamed.append(event["content"])
+                        stream.write(event["content"])
+                    elif event["type"] == "tool_call":
+                        streamed.clear()
+                        stream.print(Text(f"→ {event['name']}", style="dim"))
+                
+                result = get_agent().run(model, conversation_history, on_event=on_event)
+                
+                # Answers the agent produced itself, like the tool budget fallback, were never streamed
+                content = result["message"].get("content") or ""
+                if content and "".join(streamed) != content:
+                    stream.write(("\n\n" if streamed else "") + content)
+            
+            timing = result["timing"]
+            console.print(
+                f"[dim]model {timing['model_seconds']:.2f}s · tools {timing['tool_seconds']:.2f}s · "
+                f"{len(timing['tool_calls'])} tool calls in {timing['steps']} steps[/dim]"
+            )
+            
+            # Add the turn, including tool calls and results, to conversation history
+            store.append(session_id, conversation_history[-1:] + result["messages"], model)
+            conversation_history.extend(result["messages"])
+        except (requests.exceptions.RequestException, RuntimeError) as e:
             console.print(f"[bold red]Error: {e}. Make sure Ollama is running locally.[/bold red]")
 
 # Function to get available models from Ollama
@@ -582,29 +884,154 @@ def pull_model():
         except requests.exceptions.RequestException as e:
             console.print(f"[bold red]Error: {e}. Make sure Ollama is running locally.[/bold red]")
 
+# Serve the API over HTTP/2 with Hypercorn; without TLS it speaks h2c to clients that support it
+def run_http2_server(asgi_app, host, port, mcp_host_config, stop):
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config as HypercornConfig
+    
+    hypercorn_config = HypercornConfig()
+    hypercorn_config.bind = [f"{host}:{port}"]
+    hypercorn_config.certfile = mcp_host_config.get("certfile")
+    hypercorn_config.keyfile = mcp_host_config.get("keyfile")
+    hypercorn_config.alpn_protocols = ["h2", "http/1.1"]
+    
+    # Without a shutdown trigger Hypercorn installs signal handlers, which fails outside the main thread
+    async def shutdown_trigger():
+        await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+    
+    asyncio.run(serve(asgi_app, hypercorn_config, shutdown_trigger=shutdown_trigger))
+
+# Run a uvicorn server that graceful_shutdown can stop
+def run_uvicorn_server(asgi_app, **options):
+    # log_config=None routes uvicorn's logs through the NAPIER logging queue
+    server = uvicorn.Server(uvicorn.Config(asgi_app, log_config=None, **options))
+    api_servers.append(server)
+    server.run()
+
 # Function to start the MCP Host API server
-def start_mcp_host_server():
-    host = "0.0.0.0"
-    port = 8000
+def start_mcp_host_server(uds=None):
+    config = load_config()
+    mcp_host_config = config.get("mcp_host", DEFAULT_CONFIG["mcp_host"])
+    host = mcp_host_config.get("host", "0.0.0.0")
+    port = mcp_host_config.get("port", 8000)
     
-    console.print(f"[bold green]Starting NAPIER MCP Host API at http://{host}:{port}...[/bold green]")
+    # Network clients get negotiated compression; the local socket skips it
+    asgi_app = request_drainer
+    compression_config = config.get("compression", DEFAULT_CONFIG["compression"])
+    if compression_config.get("enabled", True):
+        asgi_app = CompressionMiddleware(
+            request_drainer,
+            minimum_size=compression_config.get("minimum_size", 1024),
+            max_request_size=compression_config.get("max_request_size", 64 * 1024 * 1024),
+            encodings=compression_config.get("encodings")
+        )
+    
+    http2 = mcp_host_config.get("http2", False)
+    if http2:
+        try:
+            import hypercorn
+        except ImportError:
+            console.print("[yellow]HTTP/2 requires hypercorn (pip install hypercorn), serving HTTP/1.1.[/yellow]")
+            http2 = False
+    
+    scheme = "https" if mcp_host_config.get("certfile") and http2 else "http"
+    console.print(f"[bold green]Starting NAPIER MCP Host API at {scheme}://{host}:{port}"
+                  f"{' (HTTP/2)' if http2 else ''}...[/bold green]")
     
     # Run the API server in a separate thread
-    threading.Thread(target=lambda: uvicorn.run(app, host=host, port=port), daemon=True).start()
+    if http2:
+        server = lambda: run_http2_server(asgi_app, host, port, mcp_host_config, api_servers_stop)
+    else:
+        server = lambda: run_uvicorn_server(asgi_app, host=host, port=port)
+    api_threads.append(threading.Thread(target=server, daemon=True))
+    api_threads[-1].start()
+    
+    # Serve the same API on a Unix domain socket for the thin CLI client
+    if uds:
+        console.print(f"[bold green]Listening for NAPIER CLI clients on {uds}...[/bold green]")
+        api_threads.append(threading.Thread(target=lambda: run_uvicorn_server(request_drainer, uds=uds), daemon=True))
+        api_threads[-1].start()
     
     # Wait for the server to start
     time.sleep(2)
     console.print("[bold green]NAPIER MCP Host API is running.[/bold green]")
 
+# Stop taking new work, let requests and tool calls in flight finish, then stop the API servers
+def graceful_shutdown():
+    timeout = load_config().get("lifecycle", DEFAULT_CONFIG["lifecycle"]).get("shutdown_timeout", 30)
+    deadline = time.monotonic() + timeout
+    
+    request_drainer.start_draining()
+    if request_drainer.in_flight:
+        console.print(f"[yellow]Waiting up to {timeout}s for {request_drainer.in_flight} requests in flight...[/yellow]")
+    request_drainer.wait_idle(max(0.0, deadline - time.monotonic()))
+    
+    if mcp_host is not None:
+        mcp_host.shutdown(timeout=max(0.0, deadline - time.monotonic()))
+    if session_store is not None:
+        session_store.stop_compaction()
+    
+    for server in api_servers:
+        server.should_exit = True
+    api_servers_stop.set()
+    for thread in api_threads:
+        thread.join(timeout=5)
+
 # API endpoints for MCP Host
 @app.get("/")
 async def root():
     return {"message": "NAPIER MCP Host API is running", "status": "active"}
 
+@app.get("/status")
+async def status_api():
+    ollama_running = await run_in_threadpool(is_ollama_running)
+    tools = await run_in_threadpool(mcp_host.check_all_connections) if mcp_host else {}
+    return {"ollama": ollama_running, "tools": tools}
+
+@app.get("/models")
+async def list_models_api():
+    return {"models": await run_in_threadpool(get_available_models)}
+
+@app.post("/models/pull")
+async def pull_model_api(request: Request):
+    data = await request.json()
+    
+    if "name" not in data:
+        raise HTTPException(status_code=400, detail="Request must include 'name'")
+    
+    try:
+        response = await run_in_threadpool(
+            requests.post, "http://localhost:11434/api/pull", json={"name": data["name"], "stream": False}
+        )
+    except requests.exceptions.RequestException as e:
+        raise HTTPException(status_code=500, detail=f"Error communicating with Ollama: {str(e)}")
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    return response.json()
+
 @app.get("/tools")
 async def list_tools():
     return {"tools": mcp_tools}
 
+@app.post("/config/reload")
+async def reload_config_api():
+    try:
+        return await run_in_threadpool(reload_mcp_tools)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/cache")
+async def cache_stats():
+    if mcp_host is None:
+        return {"entries": 0, "bytes": 0, "tools": {}}
+    return mcp_host.get_cache_stats()
+
+@app.get("/limits")
+async def limiter_stats():
+    if mcp_host is None:
+        return {}
+    return mcp_host.get_limiter_stats()
+
 @app.get("/tools/{tool_id}")
 async def get_tool(tool_id: str):
     tool = next((t for t in mcp_tools if t["id"] == tool_id), None)
@@ -612,40 +1039,379 @@ async def get_tool(tool_id: str):
         raise HTTPException(status_code=404, detail=f"Tool {tool_id} not found")
     return tool
 
-@app.post("/tools/{tool_id}/start")
-async def start_tool_api(tool_id: str):
+@app.post("/tools/{tool_id}/{action}", status_code=202)
+async def tool_lifecycle_api(tool_id: str, action: str):
+    if action not in ("install", "start", "stop", "restart"):
+        raise HTTPException(status_code=404, detail=f"Unknown tool action {action}")
+    
     tool = next((t for t in mcp_tools if t["id"] == tool_id), None)
     if not tool:
         raise HTTPException(status_code=404, detail=f"Tool {tool_id} not found")
     
-    if is_tool_running(tool):
-        return {"message": f"Tool {tool['name']} is already running"}
+    job = submit_tool_job(action, tool)
+    return {"job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}"}
+
+@app.get("/jobs/{job_id}")
+async def get_job_api(job_id: str):
+    job = job_manager.get(job_id) if job_manager else None
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events_api(job_id: str):
+    job = job_manager.get(job_id) if job_manager else None
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    # Stream progress as newline-delimited JSON until the job is done
+    async def events():
+        seen = 0
+        while True:
+            new_events = await run_in_threadpool(job.wait_for_events, seen, 15)
+            seen += len(new_events)
+            for event in new_events:
+                yield json.dumps(event) + "\n"
+            if job.done and seen >= len(job.events):
+                yield json.dumps({"status": job.status, "error": job.error}) + "\n"
+                return
     
-    success = start_mcp_tool(tool)
-    if success:
-        return {"message": f"Tool {tool['name']} started successfully"}
-    else:
-        raise HTTPException(status_code=500, detail=f"Failed to start tool {tool['name']}")
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.post("/tools/{tool_id}/actions/{action}")
+async def execute_action_api(tool_id: str, action: str, request: Request, stream: bool = False):
+    if mcp_host is None or mcp_host.get_tool(tool_id) is None:
+        raise HTTPException(status_code=404, detail=f"Tool {tool_id} not found")
+    
+    body = await request.body()
+    try:
+        params = json.loads(body) if body else {}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Action parameters must be a JSON object")
+    
+    if not stream:
+        result = await run_in_threadpool(mcp_host.execute_action_json, tool_id, action, params)
+        return Response(content=result, media_type="application/json")
+    
+    # Pass the tool's response through chunk by chunk without buffering it
+    try:
+        action_stream = await run_in_threadpool(mcp_host.execute_action_stream, tool_id, action, params)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Tool {tool_id} not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except requests.exceptions.RequestException as e:
+        raise HTTPException(status_code=502, detail=f"Error executing action {action} on {tool_id}: {e}")
+    
+    if action_stream.status_code != 200:
+        action_stream.close()
+        raise HTTPException(status_code=502,
+                            detail=f"Failed to execute action {action} on {tool_id}: {action_stream.status_code}")
+    
+    headers = {"Content-Length": action_stream.content_length} if action_stream.content_length else None
+    return StreamingResponse(action_stream.iter_chunks(), media_type=action_stream.content_type, headers=headers)
+
+@app.post("/sessions")
+async def create_session_api(request: Request):
+    body = await request.body()
+    try:
+        data = json.loads(body) if body else {}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+    store = get_session_store()
+    session_id = await run_in_threadpool(store.create_session, data.get("model"))
+    return {"session_id": session_id}
+
+@app.get("/sessions/{session_id}")
+async def get_session_api(session_id: str, limit: int = None):
+    store = get_session_store()
+    session = await run_in_threadpool(store.get_session, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    session["messages"] = await run_in_threadpool(store.load_context, session_id, limit)
+    return session
+
+# Rebuild the conversation of a session request from the session store
+async def resolve_session_request(data):
+    session_id = data.pop("session_id", None)
+    message = None
+    if session_id is not None:
+        if "message" not in data:
+            raise HTTPException(status_code=400, detail="Session requests must include 'message'")
+        store = get_session_store()
+        session = await run_in_threadpool(store.get_session, session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+        message = data.pop("message")
+        if isinstance(message, str):
+            message = {"role": "user", "content": message}
+        data.setdefault("model", session["model"] or load_config().get("default_model", "llama3"))
+        data.setdefault("stream", False)
+        data["messages"] = await run_in_threadpool(store.load_context, session_id) + [message]
+    
+    if "model" not in data or "messages" not in data:
+        raise HTTPException(status_code=400, detail="Request must include 'model' and 'messages'")
+    return session_id, message
 
 @app.post("/chat")
 async def chat_api(request: Request):
     data = await request.json()
     
-    if "model" not in data or "messages" not in data:
-        raise HTTPException(status_code=400, detail="Request must include 'model' and 'messages'")
+    # Session mode: the client sends only the new message and the context is rebuilt server-side
+    session_id, message = await resolve_session_request(data)
     
+    # Agent mode lets the model call the registered MCP tools
+    if data.pop("agent", False):
+        try:
+            result = await run_in_threadpool(get_agent().run, data["model"], data["messages"])
+        except (requests.exceptions.RequestException, RuntimeError) as e:
+            raise HTTPException(status_code=500, detail=f"Error communicating with Ollama: {str(e)}")
+        result = {"model": data["model"], "done": True, **result}
+        new_messages = result["messages"]
+    else:
+        try:
+            # Generation takes seconds; a worker thread keeps the event loop serving other clients
+            response = await run_in_threadpool(
+                requests.post,
+                "http://localhost:11434/api/chat",
+                json=data
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                new_messages = [result["message"]] if session_id is not None else []
+            else:
+                raise HTTPException(status_code=response.status_code, detail=response.text)
+        except requests.exceptions.RequestException as e:
+            raise HTTPException(status_code=500, detail=f"Error communicating with Ollama: {str(e)}")
+    
+    if session_id is not None:
+        await run_in_threadpool(get_session_store().append, session_id, [message] + new_messages, data["model"])
+        result["session_id"] = session_id
+    return result
+
+# Run one chat generation of a WebSocket connection
+async def run_chat_stream(stream, data):
     try:
-        response = requests.post(
-            "http://localhost:11434/api/chat",
-            json=data
-        )
+        session_id, message = await resolve_session_request(data)
         
-        if response.status_code == 200:
-            return response.json()
+        if data.pop("agent", False):
+            # Agent turns block on credits from a worker thread, so they get their own bounded pool
+            # instead of the one shared with every run_in_threadpool endpoint
+            result = await asyncio.get_running_loop().run_in_executor(
+                get_websocket_agent_executor(),
+                lambda: get_agent().run(data["model"], data["messages"], on_event=stream.send_from_thread)
+            )
+            final = {"type": "done", "message": result["message"], "timing": result["timing"]}
+            new_messages = result["messages"]
         else:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-    except requests.exceptions.RequestException as e:
+            reply, last_chunk = await generate_chat(stream, "http://localhost:11434", data)
+            final = {"type": "done", "message": reply,
+                     "eval_count": last_chunk.get("eval_count"), "total_duration": last_chunk.get("total_duration")}
+            new_messages = [reply]
+        
+        if session_id is not None:
+            await run_in_threadpool(get_session_store().append, session_id, [message] + new_messages, data["model"])
+            final["session_id"] = session_id
+        await stream.send_final(final)
+    except StreamStalled as e:
+        await stream.send_final({"type": "error", "status_code": 408, "detail": str(e)})
+    except (StreamCancelled, asyncio.CancelledError):
+        await stream.send_final({"type": "cancelled"})
+    except HTTPException as e:
+        await stream.send_final({"type": "error", "status_code": e.status_code, "detail": e.detail})
+    except (requests.exceptions.RequestException, httpx.HTTPError, RuntimeError) as e:
+        await stream.send_final({"type": "error", "status_code": 500, "detail": f"Error communicating with Ollama: {str(e)}"})
+    except Exception as e:
+        # Anything else (a malformed NDJSON line, an agent error) still ends the stream with a final frame
+        logger.exception(f"Chat stream {stream.stream_id} failed")
+        await stream.send_final({"type": "error", "status_code": 500, "detail": str(e)})
+
+# Read a positive integer field of a WebSocket frame
+def positive_int(frame, key, default):
+    value = frame.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"'{key}' must be a positive integer")
+    return value
+
+@app.websocket("/ws/chat")
+async def chat_websocket(websocket: WebSocket):
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    outgoing = asyncio.Queue()
+    credit_timeout = load_config().get("websocket", DEFAULT_CONFIG["websocket"]).get("credit_timeout", 60)
+    streams = {}
+    tasks = {}
+    
+    # A single writer serializes the frames of all streams onto the connection
+    async def write_frames():
+        while True:
+            frame = await outgoing.get()
+            await websocket.send_text(json.dumps(frame))
+    
+    writer = asyncio.create_task(write_frames())
+    
+    # Shutting down ends the connection instead of waiting for the client to close it
+    draining = asyncio.Event()
+    handler = asyncio.current_task()
+    unregister = request_drainer.on_drain(lambda: loop.call_soon_threadsafe(draining.set))
+    
+    async def close_on_drain():
+        await draining.wait()
+        handler.cancel()
+    
+    watcher = asyncio.create_task(close_on_drain())
+    try:
+        while True:
+            try:
+                frame = json.loads(await websocket.receive_text())
+                if not isinstance(frame, dict):
+                    raise ValueError("Frames must be JSON objects")
+            except ValueError as e:
+                await outgoing.put({"type": "error", "status_code": 400, "detail": f"Invalid frame: {e}"})
+                continue
+            
+            stream_id = frame.get("stream_id")
+            kind = frame.get("type")
+            try:
+                if kind == "chat":
+                    if not isinstance(stream_id, str) or not stream_id or stream_id in streams:
+                        raise ValueError("Chat frames need a new 'stream_id'")
+                    stream = ChatStream(stream_id, outgoing, loop, window=positive_int(frame, "window", 32),
+                                        credit_timeout=credit_timeout)
+                    streams[stream_id] = stream
+                    data = {k: v for k, v in frame.items() if k not in ("type", "stream_id", "window")}
+                    tasks[stream_id] = asyncio.create_task(run_chat_stream(stream, data))
+                    tasks[stream_id].add_done_callback(
+                        lambda t, sid=stream_id: (tasks.pop(sid, None), streams.pop(sid, None)))
+                elif kind == "credit" and stream_id in streams:
+                    await streams[stream_id].grant(positive_int(frame, "n", 1))
+                elif kind == "cancel" and stream_id in streams:
+                    await streams[stream_id].cancel()
+                    # Cancelling the task closes the Ollama connection even while it waits for the next chunk
+                    tasks[stream_id].cancel()
+            except ValueError as e:
+                await outgoing.put({"stream_id": stream_id, "type": "error", "status_code": 400, "detail": str(e)})
+    except WebSocketDisconnect:
+        pass
+    except asyncio.CancelledError:
+        if not draining.is_set():
+            raise
+    finally:
+        unregister()
+        watcher.cancel()
+        # Abandoned generations stop upstream instead of burning Ollama time
+        for stream_id, stream in list(streams.items()):
+            await stream.cancel()
+            tasks[stream_id].cancel()
+        writer.cancel()
+    
+    if draining.is_set():
+        try:
+            # 1012: service restart
+            await websocket.close(code=1012)
+        except (RuntimeError, WebSocketDisconnect):
+            pass
+
+@app.post("/embeddings")
+async def embeddings_api(request: Request):
+    data = await request.json()
+    
+    if "input" not in data:
+        raise HTTPException(status_code=400, detail="Request must include 'input'")
+    
+    texts = [data["input"]] if isinstance(data["input"], str) else data["input"]
+    model = data.get("model") or load_config().get("embeddings", DEFAULT_CONFIG["embeddings"]).get("model")
+    
+    try:
+        vectors = await get_embedding_batcher().embed(model, texts)
+    except (requests.exceptions.RequestException, RuntimeError) as e:
         raise HTTPException(status_code=500, detail=f"Error communicating with Ollama: {str(e)}")
+    
+    # Optionally store the embeddings in a local vector index
+    if data.get("index"):
+        ids = data.get("ids") or [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        metadata = data.get("metadata") or [{"text": text} for text in texts]
+        try:
+            index = get_vector_index(data["index"])
+            await run_in_threadpool(index.add, ids, vectors, metadata)
+        except RuntimeError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "object": "list",
+        "model": model,
+        "data": [{"object": "embedding", "index": i, "embedding": vector} for i, vector in enumerate(vectors)]
+    }
+
+@app.post("/embeddings/search")
+async def embeddings_search_api(request: Request):
+    data = await request.json()
+    
+    if "index" not in data or ("query" not in data and "vector" not in data):
+        raise HTTPException(status_code=400, detail="Request must include 'index' and 'query' or 'vector'")
+    
+    vector = data.get("vector")
+    if vector is None:
+        model = data.get("model") or load_config().get("embeddings", DEFAULT_CONFIG["embeddings"]).get("model")
+        try:
+            vector = (await get_embedding_batcher().embed(model, [data["query"]]))[0]
+        except (requests.exceptions.RequestException, RuntimeError) as e:
+            raise HTTPException(status_code=500, detail=f"Error communicating with Ollama: {str(e)}")
+    
+    try:
+        index = get_vector_index(data["index"])
+        results = await run_in_threadpool(index.search, vector, data.get("k", 10))
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"index": data["index"], "results": results}
+
+@app.post("/v1/batches")
+async def create_batch_api(request: Request):
+    data = await request.json()
+    
+    if "input_file" not in data:
+        raise HTTPException(status_code=400, detail="Request must include 'input_file'")
+    
+    try:
+        job = get_batch_manager().create(
+            data["input_file"],
+            output_path=data.get("output_file"),
+            concurrency=data.get("concurrency"),
+            model_concurrency=data.get("model_concurrency")
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return job.to_dict()
+
+@app.get("/v1/batches")
+async def list_batches_api():
+    return {"object": "list", "data": [job.to_dict() for job in get_batch_manager().jobs.values()]}
+
+@app.get("/v1/batches/{batch_id}")
+async def get_batch_api(batch_id: str):
+    job = get_batch_manager().get(batch_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+    return job.to_dict()
+
+@app.post("/v1/batches/{batch_id}/cancel")
+async def cancel_batch_api(batch_id: str):
+    job = get_batch_manager().get(batch_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+    job.cancel()
+    return job.to_dict()
 
 # Interactive menu for NAPIER
 def interactive_menu():
@@ -676,6 +1442,7 @@ def interactive_menu():
             ensure_mcp_tools()
         elif choice == "7":
             console.print("[bold green]Exiting NAPIER...[/bold green]")
+            graceful_shutdown()
             stop_ollama()
             sys.exit(0)
         else:
@@ -692,8 +1459,75 @@ def ensure_model_available(model_name="llama3"):
     except Exception as e:
         console.print(f"[red]Failed to pull model '{model_name}': {e}[/red]")
 
+# Restart Ollama if it stops responding while the daemon is running
+def supervise_ollama(stop_event, interval=10):
+    while not stop_event.wait(interval):
+        if not is_ollama_running():
+            logger.warning("Ollama is not responding, restarting it")
+            start_ollama()
+
+# Check whether a daemon still accepts connections on a Unix domain socket
+def is_socket_live(socket_path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    probe.settimeout(2)
+    try:
+        probe.connect(socket_path)
+        return True
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    except OSError:
+        # A socket we cannot probe may still be live, so leave it alone
+        return True
+    finally:
+        probe.close()
+
+# Run NAPIER as a long-lived daemon serving the thin CLI client over a Unix domain socket
+def run_daemon():
+    config = load_config()
+    setup_logging("server", config.get("logging", DEFAULT_CONFIG["logging"]))
+    socket_path = os.path.expanduser(config.get("daemon", DEFAULT_CONFIG["daemon"]).get("socket", "~/.napier/napier.sock"))
+    
+    # Keep the socket in a private directory and clear a socket left behind by a crashed daemon
+    os.makedirs(os.path.dirname(socket_path), mode=0o700, exist_ok=True)
+    if os.path.exists(socket_path):
+        if is_socket_live(socket_path):
+            console.print(f"[bold red]A NAPIER daemon is already listening on {socket_path}. Exiting...[/bold red]")
+            sys.exit(1)
+        os.remove(socket_path)
+    
+    if not is_ollama_installed():
+        console.print("[bold red]Ollama is required to run NAPIER. Exiting...[/bold red]")
+        sys.exit(1)
+    if not start_ollama():
+        console.print("[bold red]Failed to start Ollama. Exiting...[/bold red]")
+        sys.exit(1)
+    
+    initialize_mcp_host()
+    get_session_store()
+    start_mcp_host_server(uds=socket_path)
+    ensure_mcp_tools()
+    
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+    # SIGHUP applies configuration changes without a restart
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: threading.Thread(target=reload_on_signal, daemon=True).start())
+    threading.Thread(target=supervise_ollama, args=(stop_event,), daemon=True).start()
+    
+    console.print("[bold green]NAPIER daemon is running.[/bold green]")
+    stop_event.wait()
+    
+    console.print("[bold green]Stopping NAPIER daemon...[/bold green]")
+    graceful_shutdown()
+    stop_ollama()
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
 # Main program logic
 def main():
+    setup_logging("interactive", load_config().get("logging", DEFAULT_CONFIG["logging"]))
+    
     # Step 1: Display the animated ASCII art greeting
     animated_greeting(ASCII_ART)
     
@@ -731,5 +1565,6 @@ if __name__ == "__main__":
         main()
     except KeyboardInterrupt:
         console.print("\n[bold green]Exiting NAPIER...[/bold green]")
+        graceful_shutdown()
         stop_ollama()
         sys.exit(0)
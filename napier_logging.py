@@ -0,0 +1,174 @@
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+import logging
+import logging.handlers
+from typing import Dict, Any, Optional
+
+# Pass as `extra` to mark records logged on request hot paths, which are sampled and rate limited
+HOT_PATH = {"hot_path": True}
+
+# Loggers whose records are always treated as hot path
+HOT_PATH_LOGGERS = ("uvicorn.access",)
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != "hot_path":
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class HotPathFilter(logging.Filter):
+    """
+    Samples and rate limits hot-path records per logger and message template
+
+    Other records pass through untouched. When records were dropped, the next
+    record that passes carries the number of suppressed records.
+    """
+    def __init__(self, rate: float = 10.0, burst: int = 20, sample_rate: float = 1.0):
+        """
+        Initialize the filter
+
+        Args:
+            rate: Hot-path records allowed per second for each message template
+            burst: Number of records allowed in a burst before rate limiting kicks in
+            sample_rate: Fraction of hot-path records kept before rate limiting
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample_rate = sample_rate
+        self._buckets: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "hot_path", False) and record.name not in HOT_PATH_LOGGERS:
+            return True
+        # Warnings and errors are rate limited but never sampled away
+        if record.levelno < logging.WARNING and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # tokens, last refill, suppressed count
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that hands records to the listener thread unformatted
+
+    Message formatting, exception rendering and output all happen on the
+    listener thread, so handlers such as RichHandler keep the exception info.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener that can be stopped more than once, by its owner and at exit
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.running = False
+        self._state_lock = threading.Lock()
+
+    def start(self):
+        with self._state_lock:
+            if self.running:
+                return
+            self.running = True
+        super().start()
+
+    def stop(self):
+        with self._state_lock:
+            if not self.running:
+                return
+            self.running = False
+        super().stop()
+
+
+def setup_logging(mode: str = "interactive", logging_config: Optional[Dict[str, Any]] = None) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue to a background listener thread
+
+    Args:
+        mode: "interactive" renders to the console with Rich, "server" writes JSON lines to a file
+        logging_config: The "logging" section of the NAPIER configuration
+
+    Returns:
+        logging.handlers.QueueListener: The running listener, stopped automatically at exit
+    """
+    logging_config = logging_config or {}
+    level = getattr(logging, str(logging_config.get("level", "INFO")).upper(), logging.INFO)
+
+    if mode == "server":
+        log_file = logging_config.get("file", "logs/napier.jsonl")
+        directory = os.path.dirname(log_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        output = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=logging_config.get("max_bytes", 50 * 1024 * 1024),
+            backupCount=logging_config.get("backup_count", 5)
+        )
+        output.setFormatter(JsonFormatter())
+    else:
+        from rich.logging import RichHandler
+        output = RichHandler(rich_tracebacks=True)
+        output.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(HotPathFilter(
+        rate=logging_config.get("hot_path_rate", 10.0),
+        burst=logging_config.get("hot_path_burst", 20),
+        sample_rate=logging_config.get("hot_path_sample_rate", 1.0)
+    ))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = _QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    # Flush queued records at exit unless the caller already stopped the listener
+    atexit.register(listener.stop)
+    return listener
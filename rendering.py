@@ -0,0 +1,148 @@
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Callable, Optional
+
+from rich.console import Console
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.table import Table
+from rich.text import Text
+
+# A fenced code block opens or closes on this line
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+STATUS_PENDING = Text("checking...", style="dim")
+STATUS_RUNNING = Text("Running", style="green")
+STATUS_STOPPED = Text("Stopped", style="red")
+
+
+def _tools_table(tools: List[Dict[str, Any]], statuses: Dict[str, Text], caption: Optional[str] = None) -> Table:
+    table = Table(title="MCP Tools", caption=caption, show_header=True, header_style="bold magenta")
+    table.add_column("ID", style="dim")
+    table.add_column("Name")
+    table.add_column("URL")
+    table.add_column("Status")
+    for tool in tools:
+        # Config values are shown verbatim, never parsed as markup
+        table.add_row(Text(tool["id"]), Text(tool["name"]), Text(tool.get("url", "N/A")),
+                      statuses.get(tool["id"], STATUS_PENDING))
+    return table
+
+
+def show_tools_table(console: Console, tools: List[Dict[str, Any]], is_running: Callable[[Dict[str, Any]], bool],
+                     page_size: int = 50, max_workers: int = 8, refresh_per_second: float = 8):
+    """
+    Show the tool table immediately and fill in status cells as concurrent probes finish
+
+    Only the tools on the visible page are probed. Further pages are shown on
+    request, so very large tool lists neither flood the terminal nor wait for
+    probes nobody looks at.
+
+    Args:
+        console: Console to render to
+        tools: Tool configurations
+        is_running: Blocking status probe for one tool
+        page_size: Maximum number of rows per page
+        max_workers: Maximum number of concurrent probes
+        refresh_per_second: Maximum redraw rate of the table
+    """
+    pages = [tools[i:i + page_size] for i in range(0, len(tools), page_size)]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="napier-probe") as executor:
+        for number, page in enumerate(pages, 1):
+            statuses: Dict[str, Text] = {}
+            caption = f"Page {number} of {len(pages)}" if len(pages) > 1 else None
+            with Live(_tools_table(page, statuses, caption), console=console,
+                      refresh_per_second=refresh_per_second) as live:
+                futures = {executor.submit(is_running, tool): tool for tool in page}
+                for future in as_completed(futures):
+                    try:
+                        running = future.result()
+                    except Exception:
+                        running = False
+                    statuses[futures[future]["id"]] = STATUS_RUNNING if running else STATUS_STOPPED
+                    # Redraws happen on the Live refresh thread, at most refresh_per_second times
+                    live.update(_tools_table(page, statuses, caption), refresh=False)
+                live.update(_tools_table(page, statuses, caption), refresh=True)
+
+            if number < len(pages) and console.input("[dim]Enter for the next page, q to stop:[/dim] ").strip().lower() == "q":
+                break
+
+
+class MarkdownStream:
+    """
+    Renders streamed markdown with a capped refresh rate
+
+    Completed blocks, i.e. text before a blank line outside a code fence, are
+    printed once and never laid out again. Only the trailing block that is
+    still being written is re-rendered, so the cost of a refresh does not grow
+    with the length of the response.
+    """
+    def __init__(self, console: Console, refresh_per_second: float = 8, header: Optional[Text] = None):
+        """
+        Initialize the stream
+
+        Args:
+            console: Console to render to
+            refresh_per_second: Maximum redraw rate of the block being written
+            header: Optional line printed before the first block
+        """
+        self.console = console
+        self.header = header
+        # Text after the last completed block; it always starts outside a code fence
+        self._tail = ""
+        # The tail is only parsed when the refresh thread draws it, not on every delta
+        self._live = Live(console=console, refresh_per_second=refresh_per_second,
+                          vertical_overflow="visible", get_renderable=self._render)
+
+    def __enter__(self) -> "MarkdownStream":
+        if self.header is not None:
+            self.console.print(self.header)
+        self._live.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _render(self):
+        return Markdown(self._tail) if self._tail.strip() else Text("")
+
+    def _completed_length(self) -> int:
+        """Length of the prefix of the tail that ends with a completed block"""
+        completed = 0
+        in_fence = False
+        offset = 0
+        for line in self._tail.splitlines(keepends=True):
+            offset += len(line)
+            if not line.endswith("\n"):
+                break
+            if _FENCE.match(line):
+                in_fence = not in_fence
+            elif not in_fence and not line.strip():
+                completed = offset
+        return completed
+
+    def write(self, delta: str):
+        """Append streamed text"""
+        if not delta:
+            return
+        self._tail += delta
+        # A block can only complete at a line break
+        if "\n" in delta:
+            completed = self._completed_length()
+            if completed:
+                self._live.console.print(Markdown(self._tail[:completed]))
+                self._tail = self._tail[completed:]
+
+    def print(self, renderable):
+        """Print a line, such as a tool call notice, after the text written so far"""
+        if self._tail.strip():
+            self._live.console.print(Markdown(self._tail))
+        self._tail = ""
+        self._live.console.print(renderable)
+
+    def close(self):
+        """Render the remaining text and stop the live display"""
+        if not self._live.is_started:
+            return
+        self._live.refresh()
+        self._live.stop()
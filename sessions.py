@@ -0,0 +1,246 @@
+import json
+import os
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger("napier.sessions")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    model TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    message TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+"""
+
+
+class SessionStore:
+    """
+    Append-only chat session store backed by SQLite in WAL mode
+    """
+    def __init__(self, path: str, context_messages: int = 200):
+        """
+        Initialize the session store, creating the database if needed
+
+        Args:
+            path: Path to the SQLite database file
+            context_messages: Maximum number of recent messages used to rebuild a conversation
+        """
+        self.path = path
+        self.context_messages = context_messages
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._compaction_stop = threading.Event()
+        self._compaction_thread: Optional[threading.Thread] = None
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def create_session(self, model: Optional[str] = None) -> str:
+        """
+        Create a new session
+
+        Args:
+            model: Model used by the session
+
+        Returns:
+            str: New session ID
+        """
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "INSERT INTO sessions (id, model, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (session_id, model, now, now)
+                )
+        return session_id
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get session metadata
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Optional[Dict[str, Any]]: Session metadata, or None if the session does not exist
+        """
+        row = self._connection().execute(
+            "SELECT id, model, created_at, updated_at, message_count FROM sessions WHERE id = ?",
+            (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "model": row[1], "created_at": row[2], "updated_at": row[3], "message_count": row[4]}
+
+    def append(self, session_id: str, messages: List[Dict[str, Any]], model: Optional[str] = None) -> int:
+        """
+        Append messages to a session
+
+        Args:
+            session_id: Session ID
+            messages: Messages to append, in order
+            model: Model that produced the messages, recorded on the session
+
+        Returns:
+            int: Number of messages in the session after appending
+
+        Raises:
+            KeyError: If the session does not exist
+        """
+        now = time.time()
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                row = connection.execute("SELECT message_count FROM sessions WHERE id = ?", (session_id,)).fetchone()
+                if row is None:
+                    raise KeyError(f"Session {session_id} not found")
+                seq = row[0]
+                connection.executemany(
+                    "INSERT INTO messages (session_id, seq, role, message, created_at) VALUES (?, ?, ?, ?, ?)",
+                    [(session_id, seq + i, m.get("role", "user"), json.dumps(m), now) for i, m in enumerate(messages)]
+                )
+                count = seq + len(messages)
+                connection.execute(
+                    "UPDATE sessions SET message_count = ?, updated_at = ?, model = COALESCE(?, model) WHERE id = ?",
+                    (count, now, model, session_id)
+                )
+        return count
+
+    def load_context(self, session_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rebuild the conversation of a session from its most recent messages
+
+        Only the last `limit` messages are read, through the primary key index,
+        so resuming costs the same for long and short sessions. The window is
+        widened back to the user message that opened its first turn, so it never
+        starts with tool results whose tool calls were cut off. System messages
+        before that window are always kept.
+
+        Args:
+            session_id: Session ID
+            limit: Maximum number of recent messages, defaults to the store's context size
+
+        Returns:
+            List[Dict[str, Any]]: Messages in conversation order
+
+        Raises:
+            KeyError: If the session does not exist
+        """
+        session = self.get_session(session_id)
+        if session is None:
+            raise KeyError(f"Session {session_id} not found")
+
+        limit = self.context_messages if limit is None else limit
+        first_seq = max(0, session["message_count"] - limit)
+        connection = self._connection()
+        turn_start = connection.execute(
+            "SELECT MAX(seq) FROM messages WHERE session_id = ? AND seq <= ? AND role = 'user'",
+            (session_id, first_seq)
+        ).fetchone()[0]
+        if turn_start is None:
+            # The opening user message was compacted away, so skip ahead to the next complete turn
+            turn_start = connection.execute(
+                "SELECT MIN(seq) FROM messages WHERE session_id = ? AND seq > ? AND role = 'user'",
+                (session_id, first_seq)
+            ).fetchone()[0]
+        if turn_start is not None:
+            first_seq = turn_start
+        rows = connection.execute(
+            "SELECT message FROM messages WHERE session_id = ? AND seq < ? AND role = 'system' ORDER BY seq",
+            (session_id, first_seq)
+        ).fetchall()
+        rows += connection.execute(
+            "SELECT message FROM messages WHERE session_id = ? AND seq >= ? ORDER BY seq",
+            (session_id, first_seq)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def compact(self, older_than_days: float = 30, keep_messages: int = 50) -> int:
+        """
+        Compact sessions that have not been used for a while, keeping only their
+        system messages and most recent messages
+
+        Args:
+            older_than_days: Sessions not updated for this many days are compacted
+            keep_messages: Number of recent messages kept per compacted session
+
+        Returns:
+            int: Number of messages deleted
+        """
+        cutoff = time.time() - older_than_days * 86400
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                deleted = connection.execute(
+                    """
+                    DELETE FROM messages
+                    WHERE role != 'system' AND EXISTS (
+                        SELECT 1 FROM sessions
+                        WHERE sessions.id = messages.session_id
+                        AND sessions.updated_at < ?
+                        AND messages.seq < sessions.message_count - ?
+                    )
+                    """,
+                    (cutoff, keep_messages)
+                ).rowcount
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        if deleted:
+            logger.info(f"Compacted sessions, deleted {deleted} old messages")
+        return deleted
+
+    def start_compaction(self, interval: float = 3600, older_than_days: float = 30, keep_messages: int = 50):
+        """
+        Compact old sessions periodically in a background thread
+
+        Args:
+            interval: Seconds between compactions
+            older_than_days: Sessions not updated for this many days are compacted
+            keep_messages: Number of recent messages kept per compacted session
+        """
+        if self._compaction_thread is not None:
+            return
+
+        def run():
+            while not self._compaction_stop.wait(interval):
+                try:
+                    self.compact(older_than_days, keep_messages)
+                except sqlite3.Error as e:
+                    logger.error(f"Error compacting sessions: {e}")
+
+        self._compaction_thread = threading.Thread(target=run, name="napier-session-compaction", daemon=True)
+        self._compaction_thread.start()
+
+    def stop_compaction(self):
+        """Stop the background compaction thread"""
+        self._compaction_stop.set()
+        self._compaction_thread = None
@@ -0,0 +1,29 @@
+from mcp import AdaptiveLimiter
+
+
+def test_mixed_action_latencies_do_not_trigger_backoff():
+    limiter = AdaptiveLimiter(initial_limit=8)
+    for i in range(200):
+        assert limiter.acquire(timeout=0)
+        if i % 2:
+            limiter.release(0.200, action="slow")
+        else:
+            limiter.release(0.005, action="fast")
+    assert limiter.get_stats()["limit"] == 8
+
+
+def test_latency_spike_of_an_action_backs_off():
+    limiter = AdaptiveLimiter(initial_limit=8)
+    for _ in range(10):
+        limiter.acquire(timeout=0)
+        limiter.release(0.010, action="search")
+    limiter.acquire(timeout=0)
+    limiter.release(0.100, action="search")
+    assert limiter.get_stats()["limit"] == 4
+
+
+def test_errors_back_off():
+    limiter = AdaptiveLimiter(initial_limit=8)
+    limiter.acquire(timeout=0)
+    limiter.release(0.010, error=True, action="search")
+    assert limiter.get_stats()["limit"] == 4
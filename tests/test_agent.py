@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agent import Agent
+from mcp import MCPClient
+
+
+class OllamaHandler(BaseHTTPRequestHandler):
+    # Assistant messages returned by successive /api/chat calls; the last one repeats
+    replies = []
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        OllamaHandler.requests.append(payload)
+        reply = OllamaHandler.replies.pop(0) if len(OllamaHandler.replies) > 1 else OllamaHandler.replies[0]
+        data = json.dumps({"message": {"role": "assistant", **reply}, "done": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeClient:
+    def describe_actions(self):
+        return [{"name": "search", "description": "Search files", "parameters": {"type": "object", "properties": {}}}]
+
+
+class FakeHost:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def get_all_tools(self):
+        return {"files": FakeClient()}
+
+    def execute_action(self, tool_id, action, params):
+        self.calls.append((tool_id, action, params))
+        time.sleep(self.delay)
+        return {"found": params.get("query")}
+
+
+def tool_call(query):
+    return {"function": {"name": "files__search", "arguments": {"query": query}}}
+
+
+@pytest.fixture
+def ollama_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    OllamaHandler.requests = []
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_tool_calls_of_one_step_run_in_parallel(ollama_url):
+    OllamaHandler.replies = [
+        {"content": "", "tool_calls": [tool_call("a"), tool_call("b")]},
+        {"content": "Found a and b"},
+    ]
+    host = FakeHost(delay=0.3)
+    result = Agent(host, ollama_url=ollama_url).run("llama3", [{"role": "user", "content": "find"}])
+
+    assert result["message"]["content"] == "Found a and b"
+    assert [m["role"] for m in result["messages"]] == ["assistant", "tool", "tool", "assistant"]
+    assert [json.loads(m["content"]) for m in result["messages"][1:3]] == [{"found": "a"}, {"found": "b"}]
+    assert result["timing"]["tool_seconds"] < 0.55
+    assert OllamaHandler.requests[0]["tools"][0]["function"]["name"] == "files__search"
+
+
+def test_step_budget_ends_the_turn_with_a_fallback_answer(ollama_url):
+    OllamaHandler.replies = [{"content": "", "tool_calls": [tool_call("a")]}]
+    result = Agent(FakeHost(), ollama_url=ollama_url, max_steps=2).run("llama3", [{"role": "user", "content": "x"}])
+
+    assert result["timing"]["steps"] == 2
+    assert result["timing"]["budget_exhausted"] is True
+    assert result["message"]["content"] == "I could not finish within the tool budget for this turn."
+    # The last step does not advertise tools, so the model has to answer
+    assert "tools" not in OllamaHandler.requests[-1]
+
+
+def test_time_budget_abandons_slow_tool_calls(ollama_url):
+    OllamaHandler.replies = [{"content": "", "tool_calls": [tool_call("a")]}, {"content": "done"}]
+    agent = Agent(FakeHost(delay=1.0), ollama_url=ollama_url, max_seconds=0.3)
+    result = agent.run("llama3", [{"role": "user", "content": "x"}])
+
+    assert result["timing"]["budget_exhausted"] is True
+    assert "exceeded the turn time budget" in json.loads(result["messages"][1]["content"])["error"]
+    assert result["message"]["content"] == "I could not finish within the tool budget for this turn."
+
+
+def test_tool_specs_use_metadata_reported_by_the_tool():
+    client = MCPClient({"id": "files", "capabilities": ["search", {"name": "write", "description": "Write a file"}]})
+    client._live_actions = {
+        "search": {"name": "search", "description": "Search files",
+                   "inputSchema": {"type": "object", "properties": {"query": {"type": "string"}}}},
+        "delete": {"name": "delete", "parameters": {"type": "object", "properties": {"path": {"type": "string"}}}},
+    }
+    host = FakeHost()
+    host.get_all_tools = lambda: {"files": client}
+    specs, index = Agent(host).build_tool_specs()
+    functions = {spec["function"]["name"]: spec["function"] for spec in specs}
+
+    assert list(functions) == ["files__search", "files__write", "files__delete"]
+    assert functions["files__search"]["description"] == "Search files"
+    assert functions["files__search"]["parameters"]["properties"] == {"query": {"type": "string"}}
+    assert functions["files__write"]["description"] == "Write a file"
+    assert functions["files__delete"]["parameters"]["properties"] == {"path": {"type": "string"}}
+    assert index["files__delete"] == ("files", "delete")
@@ -0,0 +1,85 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from batch import BatchJob, BatchManager
+
+
+class OllamaHandler(BaseHTTPRequestHandler):
+    # Body returned for /api/chat; None answers with a valid chat response
+    body = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        data = OllamaHandler.body or json.dumps({
+            "model": request["model"],
+            "message": {"role": "assistant", "content": "ok"},
+            "prompt_eval_count": 3,
+            "eval_count": 2,
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def backend():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    OllamaHandler.body = None
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def run_job(tmp_path, backend):
+    input_path = tmp_path / "input.jsonl"
+    input_path.write_text("\n".join(json.dumps({"custom_id": f"r{i}", "prompt": "hi"}) for i in range(3)))
+    job = BatchJob(str(input_path), str(tmp_path / "output.jsonl"), [backend], "llama3", max_retries=0)
+    job.run()
+    return job
+
+
+def read_records(tmp_path):
+    with open(tmp_path / "output.jsonl") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_invalid_response_is_recorded_as_error(tmp_path, backend):
+    OllamaHandler.body = b"<html>proxy error</html>"
+    job = run_job(tmp_path, backend)
+    assert job.status == "completed"
+    assert job.failed == 3
+    assert [r["response"]["status_code"] for r in read_records(tmp_path)] == [502, 502, 502]
+
+
+def test_resume_retries_requests_that_failed_with_retryable_errors(tmp_path, backend):
+    OllamaHandler.body = b"not json"
+    run_job(tmp_path, backend)
+
+    OllamaHandler.body = None
+    job = run_job(tmp_path, backend)
+    assert job.skipped == 0
+    assert job.completed == 3 and job.failed == 0
+
+    job = run_job(tmp_path, backend)
+    assert job.skipped == 3 and job.completed == 0
+
+
+def test_batch_files_are_confined_to_the_batch_directory(tmp_path, backend):
+    manager = BatchManager({"directory": str(tmp_path), "backends": [backend]}, "llama3", backend)
+    (tmp_path / "outside.jsonl").write_text("")
+    for path in ["/etc/passwd", "../outside.jsonl", "sub/../../outside.jsonl"]:
+        with pytest.raises(ValueError):
+            manager.create(path)
+    with pytest.raises(ValueError):
+        manager.create("input.jsonl", output_path="/tmp/output.jsonl")
+
+    (tmp_path / "input.jsonl").write_text(json.dumps({"custom_id": "r0", "prompt": "hi"}))
+    job = manager.create("input.jsonl")
+    assert job.output_path == str(tmp_path / "input.output.jsonl")
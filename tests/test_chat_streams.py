@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from chat_streams import ChatStream, StreamCancelled, StreamStalled
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_frames_wait_for_credits():
+    async def scenario():
+        outgoing = asyncio.Queue()
+        stream = ChatStream("s1", outgoing, asyncio.get_running_loop(), window=1, credit_timeout=5)
+        await stream.send({"type": "delta", "content": "a"})
+        blocked = asyncio.create_task(stream.send({"type": "delta", "content": "b"}))
+        await asyncio.sleep(0.05)
+        assert outgoing.qsize() == 1 and not blocked.done()
+        await stream.grant(1)
+        await blocked
+        return [outgoing.get_nowait()["content"] for _ in range(2)]
+
+    assert run(scenario()) == ["a", "b"]
+
+
+def test_stream_without_credits_stalls_after_the_deadline():
+    async def scenario():
+        stream = ChatStream("s1", asyncio.Queue(), asyncio.get_running_loop(), window=0, credit_timeout=0.05)
+        with pytest.raises(StreamStalled):
+            await stream.send({"type": "delta", "content": "a"})
+        assert stream.cancelled.is_set()
+
+    run(scenario())
+
+
+def test_send_from_thread_gives_up_after_the_deadline():
+    async def scenario():
+        stream = ChatStream("s1", asyncio.Queue(), asyncio.get_running_loop(), window=0, credit_timeout=0.05)
+        with pytest.raises(StreamStalled):
+            await asyncio.get_running_loop().run_in_executor(None, stream.send_from_thread, {"type": "delta"})
+
+    run(scenario())
+
+
+def test_cancel_wakes_a_waiting_frame():
+    async def scenario():
+        stream = ChatStream("s1", asyncio.Queue(), asyncio.get_running_loop(), window=0, credit_timeout=5)
+        waiting = asyncio.create_task(stream.send({"type": "delta", "content": "a"}))
+        await asyncio.sleep(0.01)
+        await stream.cancel()
+        with pytest.raises(StreamCancelled):
+            await waiting
+
+    run(scenario())
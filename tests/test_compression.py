@@ -0,0 +1,105 @@
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+
+from compression import CompressionMiddleware, decode, encode, negotiate_encoding
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_negotiate_encoding_follows_quality_values():
+    assert negotiate_encoding("gzip, zstd", ["zstd", "gzip"]) == "zstd"
+    assert negotiate_encoding("zstd;q=0.5, gzip", ["zstd", "gzip"]) == "gzip"
+    assert negotiate_encoding("*", ["zstd", "gzip"]) == "zstd"
+    assert negotiate_encoding("*;q=0.1, gzip;q=0", ["gzip"]) is None
+    assert negotiate_encoding("identity", ["gzip"]) is None
+    assert negotiate_encoding("", ["gzip"]) is None
+
+
+def test_decode_reads_every_gzip_member():
+    body = gzip.compress(b"a" * 100) + gzip.compress(b"b" * 100)
+    assert decode("gzip", body, 1000) == b"a" * 100 + b"b" * 100
+
+
+def test_decode_rejects_truncated_and_trailing_data():
+    body = gzip.compress(b"a" * 100)
+    with pytest.raises(ValueError, match="truncated"):
+        decode("gzip", body[:-4], 1000)
+    with pytest.raises(ValueError, match="trailing"):
+        decode("deflate", zlib.compress(b"a" * 100) + b"junk", 1000)
+    with pytest.raises(ValueError, match="Unsupported"):
+        decode("br", body, 1000)
+
+
+def test_decode_caps_the_decompressed_size():
+    with pytest.raises(ValueError, match="exceeds"):
+        decode("gzip", gzip.compress(b"a" * 1000), 999)
+    with pytest.raises(ValueError, match="exceeds"):
+        decode("gzip", gzip.compress(b"a" * 600) * 2, 1000)
+    assert decode("gzip", gzip.compress(b"a" * 1000), 1000) == b"a" * 1000
+
+
+def call(app, headers, body=b""):
+    """Run one HTTP request through an ASGI app and return the messages it sends"""
+    sent = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    run(app({"type": "http", "headers": headers}, receive, send))
+    return sent
+
+
+def test_request_bodies_beyond_the_limit_are_refused():
+    async def app(scope, receive, send):
+        raise AssertionError("the app must not run")
+
+    sent = call(CompressionMiddleware(app, max_request_size=100),
+                [(b"content-encoding", b"gzip")], gzip.compress(b"a" * 101))
+    assert sent[0]["status"] == 413
+    assert "exceeds" in json.loads(sent[1]["body"])["detail"]
+
+
+def test_streamed_responses_are_compressed_chunk_by_chunk():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")]})
+        for line in (b'{"n": 1}\n', b'{"n": 2}\n'):
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    sent = call(CompressionMiddleware(app, encodings=["gzip"]), [(b"accept-encoding", b"gzip")])
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    # Every chunk decodes on arrival, before the stream is finished
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert decompressor.decompress(sent[1]["body"]) == b'{"n": 1}\n'
+    assert decompressor.decompress(sent[2]["body"]) == b'{"n": 2}\n'
+    assert decompressor.decompress(sent[3]["body"]) == b""
+    assert decompressor.eof and not sent[3]["more_body"]
+
+
+def test_small_single_body_responses_are_sent_uncompressed():
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    sent = call(CompressionMiddleware(app, minimum_size=10, encodings=["gzip"]), [(b"accept-encoding", b"gzip")])
+    assert b"content-encoding" not in dict(sent[0]["headers"])
+    assert sent[1]["body"] == b"ok"
+    assert gzip.decompress(encode("gzip", b"ok" * 10)) == b"ok" * 10
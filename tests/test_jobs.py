@@ -0,0 +1,31 @@
+import threading
+
+from jobs import JobManager
+
+
+def test_jobs_for_one_tool_run_in_order_without_holding_workers():
+    manager = JobManager(max_workers=2)
+    release = threading.Event()
+    order = []
+
+    def blocking(job):
+        release.wait(5)
+        order.append(job.kind)
+        return True
+
+    def record(job):
+        order.append(job.kind)
+        return True
+
+    first = manager.submit("start", "files", blocking)
+    queued = [manager.submit(kind, "files", record) for kind in ("stop", "restart", "install")]
+    # Queued jobs of the busy tool leave the second worker free for other tools
+    other = manager.submit("start", "search", record)
+    assert other.wait_for_events(0, timeout=5) == [] and other.status == "succeeded"
+    assert all(job.status == "pending" for job in queued)
+
+    release.set()
+    for job in queued:
+        job.wait_for_events(0, timeout=5)
+    assert first.status == "succeeded" and all(job.status == "succeeded" for job in queued)
+    assert order == ["start", "start", "stop", "restart", "install"]
@@ -0,0 +1,21 @@
+from lifecycle import RequestDrainer
+
+
+def test_drain_callbacks_run_once_when_draining_starts():
+    drainer = RequestDrainer(app=None)
+    calls = []
+    drainer.on_drain(lambda: calls.append("registered"))
+    unregister = drainer.on_drain(lambda: calls.append("unregistered"))
+    unregister()
+
+    drainer.start_draining()
+    drainer.start_draining()
+    assert calls == ["registered"]
+
+
+def test_drain_callback_registered_while_draining_runs_immediately():
+    drainer = RequestDrainer(app=None)
+    drainer.start_draining()
+    calls = []
+    drainer.on_drain(lambda: calls.append("late"))
+    assert calls == ["late"]
@@ -0,0 +1,76 @@
+import json
+import logging
+import sys
+
+import napier_logging
+from napier_logging import HOT_PATH, HotPathFilter, JsonFormatter, setup_logging
+
+
+def record(msg="request %s", level=logging.INFO, name="napier.mcp", **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, ("x",), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_hot_path_records_are_rate_limited_per_template(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(napier_logging.time, "monotonic", lambda: now[0])
+    hot_filter = HotPathFilter(rate=1.0, burst=2)
+
+    assert [hot_filter.filter(record(**HOT_PATH)) for _ in range(4)] == [True, True, False, False]
+    # Other templates and records off the hot path have their own budget
+    assert hot_filter.filter(record("other %s", **HOT_PATH))
+    assert all(hot_filter.filter(record()) for _ in range(10))
+
+    now[0] += 1.0
+    passed = record(**HOT_PATH)
+    assert hot_filter.filter(passed)
+    assert passed.suppressed == 2
+    now[0] += 1.0
+    passed = record(**HOT_PATH)
+    assert hot_filter.filter(passed)
+    assert not hasattr(passed, "suppressed")
+
+
+def test_hot_path_sampling_keeps_warnings(monkeypatch):
+    monkeypatch.setattr(napier_logging.random, "random", lambda: 0.9)
+    hot_filter = HotPathFilter(sample_rate=0.5)
+    assert not hot_filter.filter(record(**HOT_PATH))
+    assert not hot_filter.filter(record(name="uvicorn.access"))
+    assert hot_filter.filter(record(level=logging.WARNING, **HOT_PATH))
+
+
+def test_json_formatter_writes_extra_fields_and_exceptions():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = sys.exc_info()
+    entry = record(tool="files", suppressed=3, **HOT_PATH)
+    entry.exc_info = exc_info
+    line = JsonFormatter().format(entry)
+
+    data = json.loads(line)
+    assert "\n" not in line
+    assert data["message"] == "request x"
+    assert data["level"] == "INFO" and data["logger"] == "napier.mcp"
+    assert data["tool"] == "files" and data["suppressed"] == 3
+    assert "hot_path" not in data
+    assert "ValueError: boom" in data["exception"]
+
+
+def test_setup_logging_listener_can_be_stopped_twice(tmp_path):
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    try:
+        log_file = tmp_path / "napier.jsonl"
+        listener = setup_logging("server", {"file": str(log_file)})
+        logging.getLogger("napier.test").warning("hello %s", "world")
+        listener.stop()
+        listener.stop()
+        assert json.loads(log_file.read_text())["message"] == "hello world"
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
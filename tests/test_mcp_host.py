@@ -0,0 +1,140 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mcp import MCPHost
+
+
+class ToolHandler(BaseHTTPRequestHandler):
+    calls = []
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body, status=200, gzipped=False):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if gzipped:
+            data = gzip.compress(data)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._reply({"status": "ok"})
+
+    def do_POST(self):
+        params = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+        action = self.path.rsplit("/", 1)[-1]
+        ToolHandler.calls.append(action)
+        if "status" in params or "gzip" in params:
+            self._reply({"action": action}, status=params.get("status", 200), gzipped="gzip" in params)
+            return
+        if "literal" in params:
+            self._reply(params["literal"])
+            return
+        self._reply({"action": action, "params": params, "call": len(ToolHandler.calls)})
+
+
+@pytest.fixture
+def host(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ToolHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ToolHandler.calls = []
+    config = {
+        "tools": [{
+            "id": "files",
+            "name": "Files",
+            "url": f"http://127.0.0.1:{server.server_port}",
+            "capabilities": [{"name": "search", "cacheable": True}, "write"],
+            "cache": {"ttl": 60, "actions": {"stat": {"cacheable": True, "ttl": 5}}},
+        }]
+    }
+    config_path = tmp_path / "napier_config.json"
+    config_path.write_text(json.dumps(config))
+    yield MCPHost(str(config_path))
+    server.shutdown()
+
+
+def test_execute_action_returns_tool_result(host):
+    result = host.execute_action("files", "search", {"query": "napier"})
+    assert result["action"] == "search"
+    assert result["params"] == {"query": "napier"}
+
+
+def test_cacheable_action_is_served_from_cache(host):
+    first = host.execute_action("files", "search", {"query": "a"})
+    second = host.execute_action("files", "search", {"query": "a"})
+    assert first == second
+    assert ToolHandler.calls == ["search"]
+    assert host.get_cache_stats()["tools"]["files"]["hits"] == 1
+
+
+def test_mutating_action_invalidates_cached_results(host):
+    host.execute_action("files", "search", {"query": "a"})
+    host.execute_action("files", "write", {"path": "x"})
+    host.execute_action("files", "search", {"query": "a"})
+    assert ToolHandler.calls == ["search", "write", "search"]
+
+
+def test_action_policy_combines_capabilities_and_cache_config(host):
+    client = host.get_tool("files")
+    assert client.action_policy("search") == {"cacheable": True, "ttl": 60, "mutating": False}
+    assert client.action_policy("stat") == {"cacheable": True, "ttl": 5, "mutating": False}
+    assert client.action_policy("write") == {"cacheable": False, "ttl": 60, "mutating": True}
+
+
+def test_unknown_tool_returns_error(host):
+    assert host.execute_action("missing", "search", {}) == {"error": "Tool missing not found"}
+
+
+def test_streamed_action_holds_a_limiter_slot_until_closed(host):
+    stream = host.execute_action_stream("files", "search", {"query": "a"})
+    assert host.get_limiter_stats()["files"]["in_flight"] == 1
+    assert json.loads(b"".join(stream.iter_chunks()))["action"] == "search"
+    assert host.get_limiter_stats()["files"]["in_flight"] == 0
+
+
+def test_reload_keeps_tools_when_config_is_broken(host):
+    with open(host.config_path, "w") as f:
+        f.write("{not json")
+    with pytest.raises(ValueError):
+        host.reload(drain_timeout=1)
+    assert host.get_tool("files") is not None
+
+
+def test_uncached_result_is_passed_through_as_sent(host):
+    body = host.execute_action_json("files", "write", {"path": "x"})
+    assert body == json.dumps({"action": "write", "params": {"path": "x"}, "call": 1}).encode("utf-8")
+
+
+def test_cached_result_is_serialized(host):
+    host.execute_action("files", "search", {"query": "a"})
+    assert json.loads(host.execute_action_json("files", "search", {"query": "a"}))["call"] == 1
+    assert ToolHandler.calls == ["search"]
+
+
+def test_non_object_results_are_not_errors(host):
+    limit = host._limiter("files").limit
+    assert host.execute_action("files", "search", {"literal": None}) is None
+    assert host.execute_action("files", "search", {"literal": 42}) == 42
+    assert host.execute_action("files", "search", {"literal": 42}) == 42
+    assert ToolHandler.calls == ["search", "search"]
+    assert host.get_limiter_stats()["files"]["limit"] == int(limit)
+
+
+def test_streamed_compressed_result_has_no_content_length(host):
+    stream = host.execute_action_stream("files", "search", {"gzip": True})
+    assert stream.content_length is None
+    assert json.loads(b"".join(stream.iter_chunks())) == {"action": "search"}
+
+
+def test_action_file_rejects_error_responses(host):
+    with pytest.raises(RuntimeError):
+        host.execute_action_file("files", "search", {"status": 500})
+    assert host.get_limiter_stats()["files"]["in_flight"] == 0
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from sessions import SessionStore
+
+
+def turn(question, tool_result=None):
+    messages = [{"role": "user", "content": question}]
+    if tool_result is not None:
+        messages.append({"role": "assistant", "content": "", "tool_calls": [{"function": {"name": "search"}}]})
+        messages.append({"role": "tool", "content": tool_result})
+    messages.append({"role": "assistant", "content": f"answer to {question}"})
+    return messages
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(str(tmp_path / "sessions.db"), context_messages=200)
+
+
+def test_append_and_resume(store):
+    session_id = store.create_session("llama3")
+    store.append(session_id, [{"role": "system", "content": "be brief"}] + turn("a"))
+    assert store.append(session_id, turn("b", "found b"), model="mistral") == 7
+
+    assert store.get_session(session_id)["model"] == "mistral"
+    assert [m["content"] for m in store.load_context(session_id)] == [
+        "be brief", "a", "answer to a", "b", "", "found b", "answer to b"]
+
+
+def test_append_to_unknown_session_fails(store):
+    with pytest.raises(KeyError):
+        store.append("missing", turn("a"))
+    with pytest.raises(KeyError):
+        store.load_context("missing")
+
+
+def test_context_window_starts_at_a_user_message(store):
+    session_id = store.create_session()
+    store.append(session_id, [{"role": "system", "content": "be brief"}] + turn("a", "found a") + turn("b", "found b"))
+
+    # The last 3 messages start inside turn "b" with its tool call; the window widens to the user message
+    context = store.load_context(session_id, limit=3)
+    assert [m["role"] for m in context] == ["system", "user", "assistant", "tool", "assistant"]
+    assert context[1]["content"] == "b"
+
+
+def test_compaction_keeps_system_and_recent_messages(store):
+    old = store.create_session()
+    store.append(old, [{"role": "system", "content": "be brief"}] + turn("a", "found a") + turn("b"))
+    recent = store.create_session()
+    store.append(recent, turn("c"))
+    store._connection().execute("UPDATE sessions SET updated_at = ? WHERE id = ?", (time.time() - 40 * 86400, old))
+    store._connection().commit()
+
+    assert store.compact(older_than_days=30, keep_messages=3) == 3
+    # The kept messages start with the tool result of turn "a", so the context skips ahead to turn "b"
+    assert [m["content"] for m in store.load_context(old)] == ["be brief", "b", "answer to b"]
+    assert len(store.load_context(recent)) == 2
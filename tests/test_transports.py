@@ -0,0 +1,83 @@
+import sys
+import threading
+
+import pytest
+
+from transports import StdioTransport
+
+
+def idle_transport():
+    return StdioTransport("idle", [sys.executable, "-c", "import sys; sys.stdin.read()"], timeout=5)
+
+
+def test_check_connection_does_not_spawn_the_tool():
+    transport = idle_transport()
+    assert transport.check_connection() is False
+    assert transport.process is None
+
+
+def test_start_terminates_the_previous_process():
+    transport = idle_transport()
+    first = transport.start()
+    second = transport.start()
+    try:
+        assert first.poll() is not None
+        assert second.poll() is None
+    finally:
+        transport.close()
+    assert second.poll() is not None
+
+
+def test_attach_terminates_the_previous_process():
+    transport = idle_transport()
+    first = transport.start()
+    replacement = idle_transport()._spawn()
+    transport.attach(replacement)
+    try:
+        assert first.poll() is not None
+        assert transport.process is replacement
+    finally:
+        transport.close()
+
+
+def test_closed_transport_does_not_respawn_the_tool():
+    transport = idle_transport()
+    transport.close()
+    with pytest.raises(OSError):
+        transport.call("search", {})
+    assert transport.process is None
+
+
+def test_failed_handshake_terminates_the_tool():
+    transport = idle_transport()
+    transport.timeout = 0.3
+    for _ in range(2):
+        process = transport.start()
+        with pytest.raises(TimeoutError):
+            transport.connect()
+        assert process.wait(5) is not None
+        assert transport.channel is None
+    readers = [t for t in threading.enumerate() if t.name == "napier-stdio-idle"]
+    for reader in readers:
+        reader.join(5)
+    assert not any(reader.is_alive() for reader in readers)
+
+
+# Answers every request with an empty result after sending a frame that is not a JSON-RPC object
+ECHO_TOOL = """
+import json, sys
+print("[1, 2]", flush=True)
+for line in sys.stdin:
+    message = json.loads(line)
+    if "id" in message:
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": {"content": []}}), flush=True)
+"""
+
+
+def test_non_object_frames_are_ignored():
+    transport = StdioTransport("echo", [sys.executable, "-c", ECHO_TOOL], timeout=5)
+    try:
+        assert transport.call("search", {}) == {"content": []}
+        assert transport.call("search", {}) == {"content": []}
+    finally:
+        transport.close()
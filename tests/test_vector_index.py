@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from embeddings import VectorIndex
+
+
+def test_search_returns_nearest_vectors(tmp_path):
+    index = VectorIndex(str(tmp_path), "docs")
+    index.add(["a", "b"], [[1.0, 0.0], [0.0, 1.0]], [{"text": "a"}, {"text": "b"}])
+    results = index.search([0.9, 0.1], k=1)
+    assert [r["id"] for r in results] == ["a"]
+    assert results[0]["metadata"] == {"text": "a"}
+
+
+def test_add_rejects_mismatched_lengths(tmp_path):
+    index = VectorIndex(str(tmp_path), "docs")
+    with pytest.raises(ValueError):
+        index.add(["a", "b"], [[1.0, 0.0]])
+    with pytest.raises(ValueError):
+        index.add(["a"], [[1.0, 0.0]], [{}, {}])
+    assert index.entries == []
+
+
+def test_reopen_drops_vectors_written_without_metadata(tmp_path):
+    index = VectorIndex(str(tmp_path), "docs")
+    index.add(["a"], [[1.0, 0.0]])
+    # Simulate a crash between writing the vectors and the metadata of a second add
+    with open(index.vectors_path, "ab") as f:
+        f.write(b"\0" * 8)
+    with open(index.metadata_path, "a") as f:
+        f.write(json.dumps({"id": "b", "metadata": {}})[:10])
+
+    reopened = VectorIndex(str(tmp_path), "docs")
+    assert [e["id"] for e in reopened.entries] == ["a"]
+    reopened.add(["c"], [[0.0, 1.0]])
+
+    index = VectorIndex(str(tmp_path), "docs")
+    assert [e["id"] for e in index.entries] == ["a", "c"]
+    assert [r["id"] for r in index.search([0.0, 1.0], k=1)] == ["c"]
+
+
+def test_search_rejects_invalid_k_and_dimension(tmp_path):
+    index = VectorIndex(str(tmp_path), "docs")
+    index.add(["a"], [[1.0, 0.0]])
+    for k in (0, -1, "3", 1.5, True):
+        with pytest.raises(ValueError, match="k must be"):
+            index.search([1.0, 0.0], k=k)
+    with pytest.raises(ValueError, match="dimension 2"):
+        index.search([1.0, 0.0, 0.0])
+    with pytest.raises(ValueError):
+        index.search("query")
@@ -0,0 +1,443 @@
+import abc
+import json
+import itertools
+import logging
+import subprocess
+import threading
+from concurrent.futures import Future, CancelledError, TimeoutError
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+logger = logging.getLogger("napier.transports")
+
+# MCP protocol version announced during the initialize handshake
+PROTOCOL_VERSION = "2024-11-05"
+
+
+class JSONRPCError(Exception):
+    """
+    Error response to a JSON-RPC request
+    """
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(f"{message} ({code})")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class JSONRPCChannel:
+    """
+    Multiplexes JSON-RPC 2.0 requests by ID over a single message channel
+    """
+    def __init__(self, send: Callable[[str], None]):
+        """
+        Initialize the channel
+
+        Args:
+            send: Function writing one framed message to the underlying connection
+        """
+        self._send = send
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self.closed = False
+
+    def _write(self, message: Dict[str, Any]):
+        frame = json.dumps(message, separators=(",", ":"))
+        with self._send_lock:
+            self._send(frame)
+
+    def send_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Tuple[int, Future]:
+        """
+        Send a request without waiting for the response
+
+        Returns:
+            Tuple of the request ID and a future resolved with the result
+        """
+        if self.closed:
+            raise ConnectionError("Channel closed")
+        request_id = next(self._ids)
+        future = Future()
+        with self._pending_lock:
+            self._pending[request_id] = future
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        try:
+            self._write(message)
+        except Exception:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            raise
+        return request_id, future
+
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Send a request and wait for its result, cancelling it on timeout
+
+        Raises:
+            JSONRPCError: If the peer answered with an error
+            TimeoutError: If no response arrived in time
+            ConnectionError: If the channel closed before the response arrived
+        """
+        request_id, future = self.send_request(method, params)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            self.cancel(request_id, "timeout")
+            raise
+
+    def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """Send a notification, which has no response"""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        self._write(message)
+
+    def cancel(self, request_id: int, reason: str = "cancelled"):
+        """Cancel a pending request locally and ask the peer to stop working on it"""
+        with self._pending_lock:
+            future = self._pending.pop(request_id, None)
+        if future is None:
+            return
+        future.cancel()
+        try:
+            self.notify("notifications/cancelled", {"requestId": request_id, "reason": reason})
+        except Exception as e:
+            logger.debug(f"Could not send cancellation for request {request_id}: {e}")
+
+    def on_notification(self, method: str, handler: Callable[[Dict[str, Any]], None]):
+        """Register a handler for notifications sent by the peer"""
+        self._handlers.setdefault(method, []).append(handler)
+
+    def dispatch(self, frame: str):
+        """Route one incoming message to the pending request or notification handlers"""
+        try:
+            message = json.loads(frame)
+        except ValueError:
+            logger.warning(f"Ignoring malformed JSON-RPC frame: {frame[:200]}")
+            return
+        if not isinstance(message, dict):
+            logger.warning(f"Ignoring JSON-RPC frame that is not an object: {frame[:200]}")
+            return
+
+        if "method" in message:
+            if "id" in message:
+                # Requests from the peer: answer pings, reject everything else
+                if message["method"] == "ping":
+                    self._write({"jsonrpc": "2.0", "id": message["id"], "result": {}})
+                else:
+                    self._write({"jsonrpc": "2.0", "id": message["id"],
+                                 "error": {"code": -32601, "message": f"Method {message['method']} not found"}})
+                return
+            for handler in self._handlers.get(message["method"], []):
+                try:
+                    handler(message.get("params", {}))
+                except Exception as e:
+                    logger.error(f"Error handling notification {message['method']}: {e}")
+            return
+
+        with self._pending_lock:
+            future = self._pending.pop(message.get("id"), None)
+        if future is None or future.done():
+            return
+        if "error" in message:
+            error = message["error"]
+            future.set_exception(JSONRPCError(error.get("code", -32000), error.get("message", ""), error.get("data")))
+        else:
+            future.set_result(message.get("result"))
+
+    def close(self, reason: str = "Channel closed"):
+        """Fail every pending request"""
+        self.closed = True
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(ConnectionError(reason))
+
+
+class JSONRPCTransport(abc.ABC):
+    """
+    Base class for persistent MCP transports speaking JSON-RPC 2.0
+    """
+    def __init__(self, name: str, timeout: float = 60):
+        self.name = name
+        self.timeout = timeout
+        self.channel: Optional[JSONRPCChannel] = None
+        # A closed transport belongs to a retired client and must not reconnect
+        self.closed = False
+        self._connect_lock = threading.Lock()
+        self._notification_handlers: List[tuple] = []
+
+    @abc.abstractmethod
+    def _open(self) -> JSONRPCChannel:
+        """Open the underlying connection and start reading from it"""
+
+    @abc.abstractmethod
+    def _is_open(self) -> bool:
+        """Whether the underlying connection is usable"""
+
+    @abc.abstractmethod
+    def _discard(self):
+        """Tear down the connection opened by _open after a failed handshake"""
+
+    def connect(self) -> JSONRPCChannel:
+        """Open the connection and run the MCP initialize handshake if not connected yet"""
+        with self._connect_lock:
+            if self.closed:
+                raise OSError(f"Transport to {self.name} is closed")
+            if self.channel is not None and not self.channel.closed and self._is_open():
+                return self.channel
+            self.channel = None
+            channel = self._open()
+            try:
+                for method, handler in self._notification_handlers:
+                    channel.on_notification(method, handler)
+                channel.request("initialize", {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": {"name": "napier-cli", "version": "0.1.0"}
+                }, timeout=self.timeout)
+                channel.notify("notifications/initialized")
+            except BaseException:
+                # A half-initialized connection would be reused with a second reader, so drop it
+                channel.close(f"Handshake with {self.name} failed")
+                self._discard()
+                raise
+            self.channel = channel
+            logger.info(f"Connected to {self.name} over {type(self).__name__}")
+            return channel
+
+    def on_notification(self, method: str, handler: Callable[[Dict[str, Any]], None]):
+        """Register a notification handler that survives reconnects"""
+        self._notification_handlers.append((method, handler))
+        if self.channel is not None:
+            self.channel.on_notification(method, handler)
+
+    def check_connection(self) -> bool:
+        try:
+            self.connect().request("ping", timeout=2)
+            return True
+        except (OSError, JSONRPCError, TimeoutError, CancelledError) as e:
+            logger.error(f"Failed to connect to {self.name}: {e}")
+            return False
+
+    def list_actions(self) -> List[Dict[str, Any]]:
+        """List the tool's actions as capability dictionaries"""
+        result = self.connect().request("tools/list", timeout=self.timeout)
+        return [{
+            "name": tool["name"],
+            "description": tool.get("description", ""),
+            "parameters": tool.get("inputSchema", {"type": "object", "properties": {}}),
+        } for tool in result.get("tools", [])]
+
+    def call(self, action: str, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Call an action through MCP's tools/call
+
+        Raises:
+            JSONRPCError, TimeoutError, OSError: If the call fails
+        """
+        result = self.connect().request("tools/call", {"name": action, "arguments": params},
+                                        timeout=timeout or self.timeout)
+        if result.get("isError"):
+            return {"error": f"Action {action} on {self.name} failed", "details": result.get("content")}
+        return result
+
+    @abc.abstractmethod
+    def close(self):
+        """Close the connection for good"""
+
+
+class StdioTransport(JSONRPCTransport):
+    """
+    JSON-RPC over the stdin/stdout of a tool subprocess, one message per line
+
+    The transport owns the process: it is spawned by start() or on first use,
+    and a previous process is terminated before another one replaces it.
+    """
+    def __init__(self, name: str, command: List[str], cwd: str = "./", timeout: float = 60):
+        super().__init__(name, timeout)
+        self.command = command
+        self.cwd = cwd
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> subprocess.Popen:
+        """
+        Spawn the tool process, terminating the one the transport owned before
+
+        Returns:
+            subprocess.Popen: The new process
+        """
+        with self._connect_lock:
+            self._terminate()
+            self.closed = False
+            self.process = self._spawn()
+            return self.process
+
+    def attach(self, process: subprocess.Popen):
+        """Take over an already spawned process whose stdin and stdout are pipes"""
+        with self._connect_lock:
+            if process is not self.process:
+                self._terminate()
+            self.process = process
+            self.channel = None
+
+    def _spawn(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            self.command,
+            cwd=self.cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+    def _terminate(self):
+        if self.channel is not None:
+            self.channel.close(f"{self.name} closed")
+            self.channel = None
+        if self._is_open():
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def _is_open(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def _discard(self):
+        if self._is_open():
+            self.process.terminate()
+        self.process = None
+
+    def check_connection(self) -> bool:
+        # Probing a tool that is not running must not launch it
+        if not self._is_open():
+            return False
+        return super().check_connection()
+
+    def _open(self) -> JSONRPCChannel:
+        if not self._is_open():
+            self.process = self._spawn()
+        process = self.process
+
+        def send(frame: str):
+            process.stdin.write(frame.encode("utf-8") + b"\n")
+            process.stdin.flush()
+
+        channel = JSONRPCChannel(send)
+
+        def read_stdout():
+            try:
+                for line in process.stdout:
+                    if line.strip():
+                        channel.dispatch(line.decode("utf-8", "replace"))
+            except Exception as e:
+                logger.error(f"Stopped reading from {self.name}: {e}")
+            finally:
+                channel.close(f"{self.name} exited")
+                # Without a reader nothing drains stdout, so the process cannot be reused
+                if process.poll() is None:
+                    process.terminate()
+
+        def drain_stderr():
+            for line in process.stderr:
+                logger.debug(f"{self.name}: {line.decode('utf-8', 'replace').rstrip()}")
+
+        threading.Thread(target=read_stdout, name=f"napier-stdio-{self.name}", daemon=True).start()
+        if process.stderr is not None:
+            threading.Thread(target=drain_stderr, name=f"napier-stderr-{self.name}", daemon=True).start()
+        return channel
+
+    def close(self):
+        with self._connect_lock:
+            self.closed = True
+            self._terminate()
+
+
+class WebSocketTransport(JSONRPCTransport):
+    """
+    JSON-RPC over a long-lived WebSocket connection, one message per text frame
+    """
+    def __init__(self, name: str, url: str, timeout: float = 60):
+        super().__init__(name, timeout)
+        self.url = url
+        self.ws = None
+
+    def _is_open(self) -> bool:
+        return self.ws is not None and self.ws.connected
+
+    def _open(self) -> JSONRPCChannel:
+        if websocket is None:
+            raise OSError("The websocket-client package is required for WebSocket transports")
+        ws = websocket.create_connection(self.url, timeout=self.timeout)
+        ws.settimeout(None)
+        self.ws = ws
+        channel = JSONRPCChannel(ws.send)
+
+        def read_frames():
+            try:
+                while True:
+                    frame = ws.recv()
+                    if not frame:
+                        break
+                    channel.dispatch(frame)
+            except (websocket.WebSocketException, OSError) as e:
+                logger.warning(f"WebSocket connection to {self.name} closed: {e}")
+            except Exception as e:
+                logger.error(f"Stopped reading from {self.name}: {e}")
+                ws.close()
+            finally:
+                channel.close(f"WebSocket connection to {self.name} closed")
+
+        threading.Thread(target=read_frames, name=f"napier-ws-{self.name}", daemon=True).start()
+        return channel
+
+    def _discard(self):
+        if self.ws is not None:
+            self.ws.close()
+            self.ws = None
+
+    def close(self):
+        with self._connect_lock:
+            self.closed = True
+            if self.channel is not None:
+                self.channel.close(f"{self.name} closed")
+                self.channel = None
+            if self.ws is not None:
+                self.ws.close()
+                self.ws = None
+
+
+def create_transport(tool_config: Dict[str, Any]) -> Optional[JSONRPCTransport]:
+    """
+    Create the persistent transport configured for a tool
+
+    Args:
+        tool_config: Tool configuration; "transport" is "http" (default), "stdio" or "websocket"
+
+    Returns:
+        Optional[JSONRPCTransport]: The transport, or None for plain HTTP tools
+    """
+    kind = tool_config.get("transport", "http")
+    name = tool_config.get("name", tool_config.get("id"))
+    timeout = tool_config.get("timeout", 60)
+    if kind == "stdio":
+        command = tool_config.get("start_command", [])
+        if not isinstance(command, list):
+            command = command.split()
+        return StdioTransport(name, command, cwd=tool_config.get("command_directory", "./"), timeout=timeout)
+    if kind == "websocket":
+        return WebSocketTransport(name, tool_config.get("url"), timeout=timeout)
+    if kind != "http":
+        logger.warning(f"Unknown transport {kind} for {name}, using HTTP")
+    return None